@@ -1,10 +1,9 @@
-import time
 from typing import Union
 from pywinauto.timings import TimeoutError
 from pywinauto.findwindows import ElementNotFoundError
 from pywinauto.application import Application, WindowSpecification
 from .utils import Backend
-from .. import config
+from ..polling import PollingScheduler
 
 
 def connect(backend=Backend.WIN_32, timeout=60000, **connection_selectors) -> Application:
@@ -25,19 +24,15 @@ def connect(backend=Backend.WIN_32, timeout=60000, **connection_selectors) -> Ap
         app (Application): The Application/Window instance.
     """
     connect_exception = None
-    start_time = time.time()
-    while True:
-        elapsed_time = (time.time() - start_time) * 1000
-        if elapsed_time > timeout:
-            if connect_exception:
-                raise connect_exception
-            return None
+    for _ in PollingScheduler().poll(timeout):
         try:
             app = Application(backend=backend).connect(**connection_selectors)
             return app
         except Exception as e:
             connect_exception = e
-            time.sleep(config.DEFAULT_SLEEP_AFTER_ACTION/1000.0)
+    if connect_exception:
+        raise connect_exception
+    return None
 
 
 def find_window(app: Union[Application, WindowSpecification],
@@ -1,25 +1,30 @@
 import functools
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import platform
 import psutil
 import random
 import subprocess
 import time
 import webbrowser
-from typing import Union, Tuple, Optional, List, Dict, Generator, Any
+from typing import Union, Tuple, Optional, List, Dict, Generator, Any, Callable
 
 from numpy import ndarray
 
 import pyperclip
 from botcity.base import BaseBot, State
 from botcity.base.utils import is_retina, only_if_element
-from PIL import Image, ImageGrab
+from PIL import Image
 from psutil import Process
 from pynput.keyboard import Controller as KbController
 from pynput.keyboard import Key, KeyCode
 from pynput.mouse import Controller as MouseController
 
-from . import config, cv2find
+from . import capture, config, cv2find, display, writer, xtyping
+from .grabber import FrameGrabber
+from .recorder import Recorder
+from .pacing import PacingProfile
+from .polling import PollingScheduler
 from .input_utils import _mouse_click, keys_map, mouse_map
 
 try:
@@ -47,6 +52,25 @@ class DesktopBot(BaseBot):
     Attributes:
         state (State): The internal state of this bot.
         maestro (BotMaestroSDK): an instance to interact with the BotMaestro server.
+        use_location_hints (bool): Whether or not to search around the last location of an element
+            before searching the whole region. Defaults to `config.USE_LOCATION_HINTS`.
+        polling (PollingScheduler): The scheduler which paces every wait loop of this bot.
+        skip_unchanged_frames (bool): Whether or not the wait loops skip matching when the screen did not
+            change since the previous attempt. Defaults to `config.SKIP_UNCHANGED_FRAMES`.
+        incremental_search (bool): Whether or not `find_until` and `find_all` search only the areas of the
+            screen which changed since the previous attempt. Requires `skip_unchanged_frames`.
+            Defaults to `config.INCREMENTAL_SEARCH`.
+        async_screenshots (bool): Whether or not the screenshots saved to a file are written on background
+            threads by `screenshot_writer`. Defaults to `config.ASYNC_SCREENSHOTS`.
+        settle_after_action (bool): Whether or not the waits after the mouse and keyboard actions end as soon
+            as the screen stops changing instead of lasting the whole interval, which becomes the maximum.
+            Defaults to `config.SETTLE_AFTER_ACTION`.
+        settle_region_size (int): Side (px) of the area around the mouse watched in settle mode. None
+            watches the whole screen. Defaults to `config.SETTLE_REGION_SIZE`.
+        pacing (PacingProfile): The waits after each category of mouse and keyboard action.
+            Defaults to the preset named by `config.PACING_PRESET`.
+        bulk_typing (bool): Whether or not `kb_type` sends the key events of the whole text at once
+            through XTEST when available (Linux with X11). Defaults to `config.BULK_TYPING`.
 
     """
 
@@ -54,6 +78,30 @@ class DesktopBot(BaseBot):
         super().__init__()
         self._app = None
         self.state = State()
+        self._template_cache = cv2find.TemplateCache()
+        self._matching_workers = config.MATCHING_WORKERS or os.cpu_count() or 1
+        self._matching_executor = None
+        self._pyramid_levels = config.PYRAMID_LEVELS
+        self._capture_backend = None
+        self._frame_grabber = None
+        self.async_screenshots = config.ASYNC_SCREENSHOTS
+        self._screenshot_writer = None
+        self._recorder = None
+        self._recorder_backend = None
+        self._typer = None
+        self._location_hints = cv2find.LocationHints()
+        self.use_location_hints = config.USE_LOCATION_HINTS
+        self.polling = PollingScheduler()
+        self.skip_unchanged_frames = config.SKIP_UNCHANGED_FRAMES
+        self.incremental_search = config.INCREMENTAL_SEARCH
+        self.settle_after_action = config.SETTLE_AFTER_ACTION
+        self.settle_region_size = config.SETTLE_REGION_SIZE
+        self._pacing = PacingProfile.preset(config.PACING_PRESET)
+        self.bulk_typing = config.BULK_TYPING
+        self._settle_polling = PollingScheduler(
+            min_interval=config.SETTLE_INTERVAL, max_interval=config.SETTLE_INTERVAL
+        )
+        self._search_stats = cv2find.SearchStats()
         self.maestro = BotMaestroSDK() if MAESTRO_AVAILABLE else None
         self._interval = 0.005 if platform.system() == "Darwin" else 0.0
         # For parity with Java
@@ -118,6 +166,257 @@ class DesktopBot(BaseBot):
         """
         self._app = app
 
+    @property
+    def template_cache(self) -> cv2find.TemplateCache:
+        """
+        The cache of preprocessed templates used when searching for elements.
+
+        Returns:
+            cache (TemplateCache): The template cache with its hit and miss counters.
+        """
+        return self._template_cache
+
+    @property
+    def matching_workers(self) -> int:
+        """
+        Number of threads used to match templates in parallel when searching for multiple elements.
+
+        Returns:
+            workers (int): The number of matching threads.
+        """
+        return self._matching_workers
+
+    @matching_workers.setter
+    def matching_workers(self, workers: int):
+        """
+        Number of threads used to match templates in parallel when searching for multiple elements.
+
+        Args:
+            workers (int): The number of matching threads. Use 1 to match sequentially.
+        """
+        if workers < 1:
+            raise ValueError("The number of matching workers must be at least 1.")
+        self._matching_workers = workers
+        if self._matching_executor is not None:
+            self._matching_executor.shutdown(wait=False)
+            self._matching_executor = None
+
+    @property
+    def pyramid_levels(self) -> int:
+        """
+        Default number of pyramid levels used by the find methods.
+
+        With levels > 0 the screen and the template are first matched downscaled by 2**levels
+        and only the areas around the candidates are matched at full resolution.
+
+        Returns:
+            levels (int): The number of pyramid levels. 0 when disabled.
+        """
+        return self._pyramid_levels
+
+    @pyramid_levels.setter
+    def pyramid_levels(self, levels: int):
+        """
+        Default number of pyramid levels used by the find methods.
+
+        Args:
+            levels (int): The number of pyramid levels. Use 0 to disable it.
+        """
+        if levels < 0:
+            raise ValueError("The number of pyramid levels must not be negative.")
+        self._pyramid_levels = levels
+
+    @property
+    def capture_backend(self) -> capture.CaptureBackend:
+        """
+        The backend used to capture the screen.
+
+        Defaults to the backend named by `config.CAPTURE_BACKEND` or, when None, to the cheapest one
+        available on this host.
+
+        Returns:
+            backend (CaptureBackend): The capture backend.
+        """
+        if self._capture_backend is None:
+            self._capture_backend = capture.create_backend(config.CAPTURE_BACKEND)
+        return self._capture_backend
+
+    @capture_backend.setter
+    def capture_backend(self, backend: Union[capture.CaptureBackend, str, None]):
+        """
+        The backend used to capture the screen.
+
+        Args:
+            backend (CaptureBackend | str): The backend or the name of a registered backend.
+                None picks the cheapest one available.
+        """
+        if isinstance(backend, str):
+            backend = capture.create_backend(backend)
+        if self._capture_backend is not None and self._capture_backend is not backend:
+            self._capture_backend.close()
+        self._capture_backend = backend
+
+    @property
+    def pacing(self) -> PacingProfile:
+        """
+        The waits after each category of mouse and keyboard action.
+
+        Returns:
+            profile (PacingProfile): The pacing profile.
+        """
+        return self._pacing
+
+    @pacing.setter
+    def pacing(self, profile: Union[PacingProfile, str]):
+        """
+        The waits after each category of mouse and keyboard action. Can be changed at any time.
+
+        Args:
+            profile (PacingProfile | str): The profile or the name of a preset, e.g. "fast".
+        """
+        if isinstance(profile, str):
+            profile = PacingProfile.preset(profile)
+        self._pacing = profile
+
+    @property
+    def screenshot_writer(self) -> writer.ScreenshotWriter:
+        """
+        The writer which saves the screenshots when `async_screenshots` is enabled.
+
+        Use its `flush` method to wait for the pending screenshots and its counters to monitor
+        the back-pressure.
+
+        Returns:
+            writer (ScreenshotWriter): The screenshot writer.
+        """
+        if self._screenshot_writer is None:
+            self._screenshot_writer = writer.ScreenshotWriter()
+        return self._screenshot_writer
+
+    @property
+    def frame_grabber(self) -> Union[FrameGrabber, None]:
+        """
+        The background capture service started by `start_frame_grabber`.
+
+        Returns:
+            grabber (FrameGrabber): The frame grabber. None if it was never started.
+        """
+        return self._frame_grabber
+
+    def start_frame_grabber(
+        self,
+        fps: Optional[float] = None,
+        slots: Optional[int] = None,
+        backend: Optional[capture.CaptureBackend] = None,
+    ) -> FrameGrabber:
+        """
+        Capture the screen continuously on a background thread.
+
+        While running, the find methods search the most recent frame instead of capturing the screen
+        themselves, so capture and matching overlap and concurrent searches share the same frames.
+
+        Args:
+            fps (float, optional): Target frames per second. Defaults to `config.FRAME_GRABBER_FPS`.
+            slots (int, optional): Number of frames kept in the ring buffer.
+                Defaults to `config.FRAME_GRABBER_SLOTS`.
+            backend (CaptureBackend, optional): The backend used by the capture thread.
+                Defaults to a new instance of the `capture_backend` type.
+
+        Returns:
+            grabber (FrameGrabber): The running frame grabber.
+        """
+        self.stop_frame_grabber()
+        if backend is None:
+            backend = self._background_backend()
+        self._frame_grabber = FrameGrabber(backend, fps=fps, slots=slots)
+        self._frame_grabber.start()
+        return self._frame_grabber
+
+    def stop_frame_grabber(self) -> None:
+        """
+        Stop the background capture started by `start_frame_grabber`.
+        """
+        grabber = self._frame_grabber
+        if grabber is None:
+            return
+        grabber.stop()
+        if grabber.backend is not self._capture_backend:
+            grabber.backend.close()
+        self._frame_grabber = None
+
+    def _background_backend(self) -> capture.CaptureBackend:
+        backend = self.capture_backend
+        if backend.auto:
+            # The backends are not meant to be shared between threads
+            backend = capture.create_backend(backend.name)
+        return backend
+
+    def start_recording(self, filepath: str, fps: Optional[float] = None) -> Recorder:
+        """
+        Record the screen to a file on a background thread until `stop_recording` is invoked.
+
+        Only the tiles which changed between frames are stored. Use `RecordingReader` to read the frames.
+        While the frame grabber runs its frames are recorded, afterwards the screen is captured directly.
+
+        Args:
+            filepath (str): The recording file.
+            fps (float, optional): Target frames per second. Defaults to `config.RECORDER_FPS`.
+
+        Returns:
+            recorder (Recorder): The running recorder with its counters.
+        """
+        self.stop_recording()
+        grabber = self._frame_grabber
+
+        def grab():
+            if grabber is not None and grabber.running:
+                with grabber.latest() as frame:
+                    return capture.to_array(frame.image)
+            if self._recorder_backend is None:
+                # No frame grabber or it was stopped, capture the screen directly from now on
+                self._recorder_backend = self._background_backend()
+            return capture.to_array(self._recorder_backend.grab())
+
+        self._recorder = Recorder(filepath)
+        self._recorder.start(grab, fps)
+        return self._recorder
+
+    def stop_recording(self) -> None:
+        """
+        Stop the recording started by `start_recording` and finish the file.
+        """
+        if self._recorder is not None:
+            self._recorder.close()
+            self._recorder = None
+        if self._recorder_backend is not None:
+            if self._recorder_backend is not self._capture_backend:
+                self._recorder_backend.close()
+            self._recorder_backend = None
+
+    @property
+    def location_hints(self) -> cv2find.LocationHints:
+        """
+        The last known location of the elements found.
+
+        When `use_location_hints` is enabled, find_until and get_element_coords first search a padded
+        window around the last location of the label and fall back to the whole region on a miss.
+
+        Returns:
+            hints (LocationHints): The location hints with their hit and miss counters.
+        """
+        return self._location_hints
+
+    @property
+    def search_stats(self) -> cv2find.SearchStats:
+        """
+        Counters of the frames captured by the wait loops and of the ones skipped because the
+        screen did not change.
+
+        Returns:
+            stats (SearchStats): The search statistics.
+        """
+        return self._search_stats
+
     ##########
     # Display
     ##########
@@ -148,6 +447,23 @@ class DesktopBot(BaseBot):
         img = Image.open(path)
         return img
 
+    def _load_template(self, label: str, grayscale: bool = False) -> Union[ndarray, None]:
+        """
+        Load the image for the given label as a template ready to be matched.
+
+        Args:
+            label (str): The image identifier
+            grayscale (bool, optional): Whether or not to convert the template to grayscale.
+                Defaults to False.
+
+        Returns:
+            template (ndarray): The template array. None if no image is found for label.
+        """
+        path = self._search_image_file(label)
+        if not path:
+            return None
+        return self._template_cache.get(path, grayscale)
+
     def find_multiple(
         self,
         labels: List,
@@ -161,10 +477,20 @@ class DesktopBot(BaseBot):
         waiting_time: int = 10000,
         best: bool = True,
         grayscale: bool = False,
+        pyramid: Optional[int] = None,
+        incremental: bool = False,
+        monitor: Optional[int] = None,
     ) -> Dict:
         """
         Find multiple elements defined by label on screen until a timeout happens.
 
+        The labels are matched in parallel against the same screenshot using
+        up to `matching_workers` threads.
+
+        In incremental mode the elements already found are only checked again at their
+        last position on the new screenshots and the full search is repeated only for
+        the labels still missing.
+
         Args:
             labels (list): A list of image identifiers
             x (int): Search region start position x. Defaults to 0.
@@ -181,6 +507,12 @@ class DesktopBot(BaseBot):
                 Defaults to True.
             grayscale (bool, optional): Whether or not to convert to grayscale before searching.
                 Defaults to False.
+            pyramid (int, optional): Number of pyramid levels used to search on a downscaled screen first
+                and refine the candidates at full resolution. 0 disables it. Defaults to `pyramid_levels`.
+            incremental (bool, optional): Whether or not to keep the elements already found between
+                screenshots and search again only for the missing ones. Defaults to False.
+            monitor (int, optional): Index of the monitor to search, as in `get_monitors`. The search region
+                is then relative to the monitor and limited to it. Defaults to None, the whole screen.
 
         Returns:
             results (dict): A dictionary in which the key is the label and value are the element coordinates in a
@@ -190,15 +522,11 @@ class DesktopBot(BaseBot):
         def _to_dict(lbs, elems):
             return {k: v for k, v in zip(lbs, elems)}
 
-        screen_w, screen_h = self._fix_display_size()
-        w = width or screen_w
-        h = height or screen_h
-
-        region = (x, y, w, h)
+        region = self._search_region(x, y, width, height, monitor)
 
         results = [None] * len(labels)
-        paths = [self._search_image_file(la) for la in labels]
-        paths = [self._image_path_as_image(la) for la in paths]
+        needles = [self._load_template(la, grayscale) for la in labels]
+        pyramid = self._pyramid_levels if pyramid is None else pyramid
 
         if threshold:
             # TODO: Figure out how we should do threshold
@@ -210,25 +538,339 @@ class DesktopBot(BaseBot):
                 "Warning: Ignoring best=False for now. It will be supported in the future."
             )
 
-        start_time = time.time()
+        found = [None] * len(labels)
+        tracker = self._new_change_tracker()
+        started = time.monotonic()
 
-        while True:
-            elapsed_time = (time.time() - start_time) * 1000
-            if elapsed_time > waiting_time:
+        for _ in self.polling.poll(waiting_time):
+            haystack, search_region, offset = self._grab_search_region(region, started, grayscale)
+            if self._skip_frame(tracker, haystack):
+                continue
+            # Convert the frame once and share it among all the needles
+            haystack = cv2find.Haystack(haystack)
+            helper = functools.partial(
+                self._find_multiple_helper, haystack, search_region, matching, grayscale, offset,
+                pyramid=pyramid,
+            )
+
+            if incremental:
+                pending = [
+                    idx for idx, ele in enumerate(found)
+                    if ele is None or not self._is_still_visible(
+                        haystack, offset, matching, grayscale, needles[idx], ele
+                    )
+                ]
+            else:
+                pending = list(range(len(labels)))
+
+            matches = self._match_needles(helper, [needles[idx] for idx in pending])
+            for idx, ele in zip(pending, matches):
+                found[idx] = ele
+
+            results = [self._fix_retina_element(r) for r in found]
+            if None not in results:
                 return _to_dict(labels, results)
 
-            haystack = self.screenshot()
+        return _to_dict(labels, results)
+
+    def find_multiple_iter(
+        self,
+        labels: List,
+        x: int = 0,
+        y: int = 0,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        *,
+        matching: float = 0.9,
+        waiting_time: int = 10000,
+        grayscale: bool = False,
+        pyramid: Optional[int] = None,
+        monitor: Optional[int] = None,
+    ) -> Generator[Tuple[str, cv2find.Box], Any, None]:
+        """
+        Find multiple elements defined by label on screen until a timeout happens,
+        yielding each element as soon as it is found.
+
+        Labels already found are not searched again on the following screenshots.
+
+        Args:
+            labels (list): A list of image identifiers
+            x (int): Search region start position x. Defaults to 0.
+            y (int): Search region start position y. Defaults to 0.
+            width (int, optional): Search region width. Defaults to screen width.
+            height (int, optional): Search region height. Defaults to screen height.
+            matching (float, optional): The matching index ranging from 0 to 1.
+                Defaults to 0.9.
+            waiting_time (int, optional): Maximum wait time (ms) to search for a hit.
+                Defaults to 10000ms (10s).
+            grayscale (bool, optional): Whether or not to convert to grayscale before searching.
+                Defaults to False.
+            pyramid (int, optional): Number of pyramid levels used to search on a downscaled screen first
+                and refine the candidates at full resolution. 0 disables it. Defaults to `pyramid_levels`.
+            monitor (int, optional): Index of the monitor to search, as in `get_monitors`. The search region
+                is then relative to the monitor and limited to it. Defaults to None, the whole screen.
+
+        Returns:
+            results (collections.Iterable[Tuple]): A generator of tuples with the label and the element
+                coordinates in a NamedTuple. Labels not found before the timeout are not yielded.
+        """
+        region = self._search_region(x, y, width, height, monitor)
+
+        needles = [self._load_template(la, grayscale) for la in labels]
+        pyramid = self._pyramid_levels if pyramid is None else pyramid
+        pending = list(range(len(labels)))
+
+        tracker = self._new_change_tracker()
+        started = time.monotonic()
+
+        for _ in self.polling.poll(waiting_time):
+            haystack, search_region, offset = self._grab_search_region(region, started, grayscale)
+            if self._skip_frame(tracker, haystack):
+                continue
+            haystack = cv2find.Haystack(haystack)
             helper = functools.partial(
-                self._find_multiple_helper, haystack, region, matching, grayscale
+                self._find_multiple_helper, haystack, search_region, matching, grayscale, offset,
+                pyramid=pyramid,
             )
 
-            results = [helper(p) for p in paths]
+            matches = self._match_needles(helper, [needles[idx] for idx in pending])
+            for idx, ele in zip(list(pending), matches):
+                if ele is None:
+                    continue
+                pending.remove(idx)
+                yield labels[idx], self._fix_retina_element(ele)
+
+            if not pending:
+                return
+
+    def wait_for_any(
+        self,
+        labels: List,
+        x: Optional[int] = None,
+        y: Optional[int] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        *,
+        matching: float = 0.9,
+        waiting_time: int = 10000,
+        grayscale: bool = False,
+        pyramid: Optional[int] = None,
+        monitor: Optional[int] = None,
+    ) -> Union[Tuple[str, cv2find.Box], Tuple[None, None]]:
+        """
+        Wait until any of the elements defined by labels is on screen.
+
+        Every screenshot is shared by all the labels and the search stops as soon as one of them
+        is found. When more than one label is visible on the same screenshot, the first one found is
+        returned, which is the first in labels order unless `matching_workers` is greater than 1.
 
-            results = [self._fix_retina_element(r) for r in results]
-            if None in results:
+        Args:
+            labels (list): A list of image identifiers
+            x (int, optional): Search region start position x. Defaults to 0.
+            y (int, optional): Search region start position y. Defaults to 0.
+            width (int, optional): Search region width. Defaults to screen width.
+            height (int, optional): Search region height. Defaults to screen height.
+            matching (float, optional): The matching index ranging from 0 to 1.
+                Defaults to 0.9.
+            waiting_time (int, optional): Maximum wait time (ms) to search for a hit.
+                Defaults to 10000ms (10s).
+            grayscale (bool, optional): Whether or not to convert to grayscale before searching.
+                Defaults to False.
+            pyramid (int, optional): Number of pyramid levels used to search on a downscaled screen first
+                and refine the candidates at full resolution. 0 disables it. Defaults to `pyramid_levels`.
+            monitor (int, optional): Index of the monitor to search, as in `get_monitors`. The search region
+                is then relative to the monitor and limited to it. Defaults to None, the whole screen.
+
+        Returns:
+            result (Tuple): The label found and the element coordinates in a NamedTuple.
+                (None, None) if none was found.
+        """
+        self.state.element = None
+        region = self._search_region(x, y, width, height, monitor)
+
+        needles = [self._load_template(la, grayscale) for la in labels]
+        pyramid = self._pyramid_levels if pyramid is None else pyramid
+
+        tracker = self._new_change_tracker()
+        started = time.monotonic()
+
+        for _ in self.polling.poll(waiting_time):
+            haystack, search_region, offset = self._grab_search_region(region, started, grayscale)
+            if self._skip_frame(tracker, haystack):
                 continue
-            else:
-                return _to_dict(labels, results)
+            haystack = cv2find.Haystack(haystack)
+            helper = functools.partial(
+                self._find_multiple_helper, haystack, search_region, matching, grayscale, offset,
+                pyramid=pyramid,
+            )
+
+            idx, ele = self._match_first(helper, needles)
+            if ele is not None:
+                ele = self._fix_retina_element(ele)
+                self.state.element = ele
+                return labels[idx], ele
+
+        return None, None
+
+    def wait_until_vanish(
+        self,
+        label: str,
+        x: Optional[int] = None,
+        y: Optional[int] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        *,
+        matching: float = 0.9,
+        waiting_time: int = 10000,
+        grayscale: bool = False,
+        monitor: Optional[int] = None,
+    ) -> bool:
+        """
+        Wait until the element defined by label is no longer on screen.
+
+        Args:
+            label (str): The image identifier
+            x (int, optional): Search region start position x. Defaults to 0.
+            y (int, optional): Search region start position y. Defaults to 0.
+            width (int, optional): Search region width. Defaults to screen width.
+            height (int, optional): Search region height. Defaults to screen height.
+            matching (float, optional): The matching index ranging from 0 to 1.
+                Defaults to 0.9.
+            waiting_time (int, optional): Maximum wait time (ms) for the element to vanish.
+                Defaults to 10000ms (10s).
+            grayscale (bool, optional): Whether or not to convert to grayscale before searching.
+                Defaults to False.
+            monitor (int, optional): Index of the monitor to search, as in `get_monitors`. The search region
+                is then relative to the monitor and limited to it. Defaults to None, the whole screen.
+
+        Returns:
+            vanished (bool): True if the element is not on screen. False if it was still visible after
+                the waiting time.
+        """
+        region = self._search_region(x, y, width, height, monitor)
+        needle = self._load_template(label, grayscale)
+
+        # Frames are only tracked while the element is visible, so an identical frame
+        # means that it is still there.
+        tracker = self._new_change_tracker()
+        started = time.monotonic()
+
+        for _ in self.polling.poll(waiting_time):
+            haystack, search_region, offset = self._grab_search_region(region, started, grayscale)
+            if self._skip_frame(tracker, haystack):
+                continue
+            ele = self._find_multiple_helper(haystack, search_region, matching, grayscale, offset, needle)
+            if ele is None:
+                return True
+
+        return False
+
+    def wait_until_stable(
+        self,
+        x: Optional[int] = None,
+        y: Optional[int] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        *,
+        stable_time: int = 500,
+        waiting_time: int = 10000,
+        monitor: Optional[int] = None,
+    ) -> bool:
+        """
+        Wait until a region of the screen stops changing.
+
+        Args:
+            x (int, optional): Region start position x. Defaults to 0.
+            y (int, optional): Region start position y. Defaults to 0.
+            width (int, optional): Region width. Defaults to screen width.
+            height (int, optional): Region height. Defaults to screen height.
+            stable_time (int, optional): For how long (ms) the region must remain identical.
+                Defaults to 500ms.
+            waiting_time (int, optional): Maximum wait time (ms) for the region to become stable.
+                Defaults to 10000ms (10s).
+            monitor (int, optional): Index of the monitor, as in `get_monitors`. The region is then
+                relative to the monitor. Defaults to None, the whole screen.
+
+        Returns:
+            stable (bool): True if the region did not change for `stable_time`. False otherwise.
+        """
+        region = self._search_region(x, y, width, height, monitor)
+        return self._wait_stable(region, stable_time, waiting_time, self.polling)
+
+    def _wait_stable(
+        self,
+        region: Tuple[int, int, int, int],
+        stable_time: int,
+        waiting_time: int,
+        polling: PollingScheduler,
+        min_time: int = 0,
+    ) -> bool:
+        tracker = cv2find.ChangeTracker()
+        stable_since = None
+        started = time.monotonic()
+
+        for _ in polling.poll(waiting_time):
+            captured_at = time.monotonic()
+            haystack, _, _ = self._grab_search_region(region, started)
+            if tracker.changed(haystack):
+                stable_since = captured_at
+            elif (
+                (captured_at - stable_since) * 1000 >= stable_time
+                and (captured_at - started) * 1000 >= min_time
+            ):
+                return True
+
+        return False
+
+    def _settle_region(self) -> Tuple[int, int, int, int]:
+        screen_w, screen_h = self._fix_display_size()
+        size = self.settle_region_size
+        if not size:
+            return 0, 0, screen_w, screen_h
+        mouse_x, mouse_y = self._mouse_controller.position
+        x = min(max(int(mouse_x) - size // 2, 0), max(screen_w - size, 0))
+        y = min(max(int(mouse_y) - size // 2, 0), max(screen_h - size, 0))
+        return x, y, min(size, screen_w), min(size, screen_h)
+
+    def _wait_after_action(self, delay: int) -> None:
+        """
+        Wait after a mouse or keyboard action.
+
+        In settle mode the wait ends once the area around the mouse, or the whole screen, did not change
+        for `config.SETTLE_STABLE_TIME`, lasts at least `config.SETTLE_MIN_WAIT` and at most delay.
+        Otherwise it sleeps for delay.
+
+        Args:
+            delay (int): The wait interval (ms).
+        """
+        if not self.settle_after_action or delay <= max(config.SETTLE_STABLE_TIME, config.SETTLE_MIN_WAIT):
+            self.sleep(delay)
+            return
+        started = time.monotonic()
+        try:
+            self._wait_stable(
+                self._settle_region(), config.SETTLE_STABLE_TIME, delay, self._settle_polling,
+                min_time=config.SETTLE_MIN_WAIT,
+            )
+        except Exception:
+            # e.g. the screen is locked, fall back to the fixed wait for the time left
+            elapsed = (time.monotonic() - started) * 1000
+            self.sleep(max(delay - elapsed, 0))
+
+    def _is_still_visible(
+        self,
+        haystack: cv2find.Haystack,
+        offset: Tuple[int, int],
+        confidence: float,
+        grayscale: bool,
+        needle: ndarray,
+        ele: cv2find.Box,
+    ) -> bool:
+        """
+        Check whether the needle still matches at the exact position of a previous hit.
+        """
+        window = (ele.left - offset[0], ele.top - offset[1], ele.width, ele.height)
+        return self._find_multiple_helper(haystack, window, confidence, grayscale, offset, needle) is not None
 
     def _fix_retina_element(self, ele: cv2find.Box) -> cv2find.Box:
         if not is_retina():
@@ -245,23 +887,167 @@ class DesktopBot(BaseBot):
             return ele
 
     def _fix_display_size(self) -> Tuple[int, int]:
-        width, height = ImageGrab.grab().size
+        width, height = display.screen_size()
 
         if not is_retina():
             return width, height
 
         return int(width * 2), int(height * 2)
 
+    def _search_region(
+        self,
+        x: Optional[int],
+        y: Optional[int],
+        width: Optional[int],
+        height: Optional[int],
+        monitor: Optional[int] = None,
+    ) -> Tuple[int, int, int, int]:
+        """
+        The search area in screen coordinates. With a monitor, x and y are relative to it and the
+        area does not extend beyond it.
+        """
+        x = x or 0
+        y = y or 0
+        if monitor is None:
+            screen_w, screen_h = self._fix_display_size()
+            return x, y, width or screen_w, height or screen_h
+        return display.monitor_region(monitor, x, y, width, height)
+
+    def _monitor_area(
+        self, region: Optional[Tuple[int, int, int, int]], monitor: Optional[int]
+    ) -> Optional[Tuple[int, int, int, int]]:
+        if monitor is None:
+            return region
+        mon = display.get_monitor(monitor)
+        if region is None:
+            return mon.left, mon.top, mon.width, mon.height
+        x, y, width, height = region
+        return mon.left + x, mon.top + y, width, height
+
+    def _grab_search_region(
+        self, region: Tuple[int, int, int, int], since: Optional[float] = None, grayscale: bool = False
+    ) -> Tuple[ndarray, Optional[Tuple[int, int, int, int]], Tuple[int, int]]:
+        """
+        Capture the pixels needed to search the given screen region.
+
+        Args:
+            region (tuple): Bounding box containing left, top, width and height of the search area.
+            since (float, optional): When the frame grabber is running, the `time.monotonic` value after
+                which the frame must have been captured. Defaults to None.
+            grayscale (bool, optional): Whether or not to capture in grayscale. Defaults to False.
+
+        Returns:
+            haystack (ndarray): The BGR or grayscale pixels.
+            region (tuple, optional): The area to search within the haystack. None for the whole haystack.
+            offset (tuple): The offset that maps haystack coordinates back to screen coordinates.
+        """
+        x, y, width, height = region
+        screen_w, screen_h = display.screen_size()
+        left, top = max(x, 0), max(y, 0)
+        right, bottom = min(x + width, screen_w), min(y + height, screen_h)
+        if right > left and bottom > top:
+            area = (left, top, right - left, bottom - top)
+            return self._capture_array(area, grayscale, since=since), None, (left, top)
+        return self._capture_array(None, grayscale, since=since), region, (0, 0)
+
+    def _capture_array(
+        self,
+        region: Optional[Tuple[int, int, int, int]] = None,
+        grayscale: bool = False,
+        out: Optional[ndarray] = None,
+        since: Optional[float] = None,
+    ) -> ndarray:
+        grabber = self._frame_grabber
+        if grabber is not None and grabber.running:
+            with grabber.latest(since) as frame:
+                return capture.to_array(frame.image, region, grayscale, out)
+
+        backend = self.capture_backend
+        # Backends without region support (e.g. PIL on macOS, where the grab bounding box is
+        # expressed in points) capture the whole screen, which is sliced instead.
+        if region and backend.supports_region:
+            return capture.to_array(backend.grab(region), None, grayscale, out)
+        return capture.to_array(backend.grab(), region, grayscale, out)
+
+    def _match_needles(self, func: Callable, needles: List) -> List:
+        """
+        Apply func to every needle using the matching thread pool.
+
+        Args:
+            func (callable): The function to invoke for each needle.
+            needles (list): The templates to be matched.
+
+        Returns:
+            results (list): The results in the same order as needles.
+        """
+        if len(needles) < 2 or self._matching_workers < 2:
+            return [func(n) for n in needles]
+
+        executor = self._get_matching_executor()
+        futures = {idx: executor.submit(func, needles[idx]) for idx in self._matching_order(needles)}
+        return [futures[idx].result() for idx in range(len(needles))]
+
+    def _match_first(self, func: Callable, needles: List) -> Tuple[Optional[int], Optional[cv2find.Box]]:
+        """
+        Apply func to the needles until one of them is found. The remaining tasks are cancelled.
+
+        Args:
+            func (callable): The function to invoke for each needle.
+            needles (list): The templates to be matched.
+
+        Returns:
+            index (int): The index of the needle found. None if no needle was found.
+            element (NamedTuple): The element coordinates. None if no needle was found.
+        """
+        if len(needles) < 2 or self._matching_workers < 2:
+            for idx, needle in enumerate(needles):
+                ele = func(needle)
+                if ele is not None:
+                    return idx, ele
+            return None, None
+
+        executor = self._get_matching_executor()
+        futures = {executor.submit(func, needles[idx]): idx for idx in self._matching_order(needles)}
+        try:
+            for future in as_completed(futures):
+                ele = future.result()
+                if ele is not None:
+                    return futures[future], ele
+        finally:
+            for future in futures:
+                future.cancel()
+        return None, None
+
+    def _get_matching_executor(self) -> ThreadPoolExecutor:
+        if self._matching_executor is None:
+            self._matching_executor = ThreadPoolExecutor(
+                max_workers=self._matching_workers, thread_name_prefix="botcity-matching"
+            )
+        return self._matching_executor
+
+    def _matching_order(self, needles: List) -> List[int]:
+        # Workers pull tasks from a shared queue, so submitting the largest templates first
+        # leaves the cheaper ones to fill the gaps and balances uneven template sizes.
+        def cost(idx):
+            needle = needles[idx]
+            return needle.size if isinstance(needle, ndarray) else 0
+
+        return sorted(range(len(needles)), key=cost, reverse=True)
+
     def _find_multiple_helper(
         self,
-        haystack: Image.Image,
-        region: Tuple[int, int, int, int],
+        haystack: cv2find.Haystack,
+        region: Optional[Tuple[int, int, int, int]],
         confidence: float,
         grayscale: bool,
+        offset: Tuple[int, int],
         needle: Union[Image.Image, ndarray, str],
+        pyramid: int = 0,
+        windows: Optional[List[Tuple[int, int, int, int]]] = None,
     ) -> Union[cv2find.Box, None]:
         ele = cv2find.locate_all_opencv(
-            needle, haystack, region=region, confidence=confidence, grayscale=grayscale
+            needle, haystack, region=region, confidence=confidence, grayscale=grayscale, offset=offset,
+            limit=1, pyramid=pyramid, windows=windows,
         )
         try:
             ele = next(ele)
@@ -269,6 +1055,105 @@ class DesktopBot(BaseBot):
             ele = None
         return ele
 
+    def _find_element(
+        self,
+        label: str,
+        needle: ndarray,
+        region: Tuple[int, int, int, int],
+        confidence: float,
+        grayscale: bool,
+        pyramid: int,
+        tracker: Optional[cv2find.ChangeTracker] = None,
+        since: Optional[float] = None,
+    ) -> Union[cv2find.Box, None]:
+        """
+        Capture the screen and return the best match of needle inside region.
+
+        When location hints are enabled the window around the last hit of label is searched first,
+        on the same capture as the whole region. With a change tracker, areas identical to the
+        previous capture of the same search are not matched again.
+        """
+        haystack, search_region, offset = self._grab_search_region(region, since, grayscale)
+        windows = self._search_windows(tracker, haystack, region, needle)
+        if windows == []:
+            return None
+
+        if self.use_location_hints and needle is not None:
+            size = needle.shape[1], needle.shape[0]
+            window = self._location_hints.window(label, region, size)
+            if window is not None:
+                left, top, width, height = window
+                hint = (left - offset[0], top - offset[1], width, height)
+                hint_windows = [hint] if windows is None else self._clip_windows(windows, hint)
+                if hint_windows:
+                    ele = self._find_multiple_helper(
+                        haystack, search_region, confidence, grayscale, offset, needle, windows=hint_windows
+                    )
+                    self._location_hints.record(ele is not None)
+                    if ele is not None:
+                        self._location_hints.update(label, ele)
+                        return ele
+
+        ele = self._find_multiple_helper(
+            haystack, search_region, confidence, grayscale, offset, needle, pyramid=pyramid, windows=windows
+        )
+        if ele is not None and self.use_location_hints:
+            self._location_hints.update(label, ele)
+        return ele
+
+    @staticmethod
+    def _clip_windows(
+        windows: List[Tuple[int, int, int, int]], area: Tuple[int, int, int, int]
+    ) -> List[Tuple[int, int, int, int]]:
+        """
+        The parts of windows inside area.
+        """
+        clipped = []
+        for left, top, width, height in windows:
+            x0, y0 = max(left, area[0]), max(top, area[1])
+            x1 = min(left + width, area[0] + area[2])
+            y1 = min(top + height, area[1] + area[3])
+            if x1 > x0 and y1 > y0:
+                clipped.append((x0, y0, x1 - x0, y1 - y0))
+        return clipped
+
+    def _new_change_tracker(self, incremental: bool = False) -> Union[cv2find.ChangeTracker, None]:
+        if not self.skip_unchanged_frames:
+            return None
+        return cv2find.ChangeTracker(keep_frames=incremental and self.incremental_search)
+
+    def _search_windows(
+        self,
+        tracker: Optional[cv2find.ChangeTracker],
+        haystack: Union[Image.Image, ndarray],
+        key: Any = None,
+        needle: Optional[ndarray] = None,
+    ) -> Optional[List[Tuple[int, int, int, int]]]:
+        """
+        The areas of haystack which changed since the previous capture of the same search.
+        Searches must only track frames in which nothing was found.
+
+        Returns:
+            windows (list): The areas to search. Empty if matching can be skipped. None to search everything.
+        """
+        if tracker is None:
+            return None
+        padding = (0, 0)
+        if needle is not None:
+            padding = (needle.shape[1] - 1, needle.shape[0] - 1)
+        windows = tracker.search_windows(haystack, key, padding)
+        self._search_stats.record(windows == [], bool(windows))
+        return windows
+
+    def _skip_frame(
+        self, tracker: Optional[cv2find.ChangeTracker], haystack: Union[Image.Image, ndarray], key: Any = None
+    ) -> bool:
+        """
+        Whether or not haystack is identical to the previous capture of the same search and the
+        matching can be skipped. Searches must only track frames in which nothing was found.
+        """
+        return self._search_windows(tracker, haystack, key) == []
+
     def find(
         self,
         label: str,
@@ -282,6 +1167,8 @@ class DesktopBot(BaseBot):
         waiting_time: int = 10000,
         best: bool = True,
         grayscale: bool = False,
+        pyramid: Optional[int] = None,
+        monitor: Optional[int] = None,
     ) -> Union[cv2find.Box, None]:
         """
         Find an element defined by label on screen until a timeout happens.
@@ -302,6 +1189,10 @@ class DesktopBot(BaseBot):
                 Defaults to True.
             grayscale (bool, optional): Whether or not to convert to grayscale before searching.
                 Defaults to False.
+            pyramid (int, optional): Number of pyramid levels used to search on a downscaled screen first
+                and refine the candidates at full resolution. 0 disables it. Defaults to `pyramid_levels`.
+            monitor (int, optional): Index of the monitor to search, as in `get_monitors`. The search region
+                is then relative to the monitor and limited to it. Defaults to None, the whole screen.
 
         Returns:
             element (NamedTuple): The element coordinates. None if not found.
@@ -317,6 +1208,8 @@ class DesktopBot(BaseBot):
             waiting_time=waiting_time,
             best=best,
             grayscale=grayscale,
+            pyramid=pyramid,
+            monitor=monitor,
         )
 
     def find_until(
@@ -332,6 +1225,8 @@ class DesktopBot(BaseBot):
         waiting_time: int = 10000,
         best: bool = True,
         grayscale: bool = False,
+        pyramid: Optional[int] = None,
+        monitor: Optional[int] = None,
     ) -> Union[cv2find.Box, None]:
         """
         Find an element defined by label on screen until a timeout happens.
@@ -352,21 +1247,19 @@ class DesktopBot(BaseBot):
                 Defaults to True.
             grayscale (bool, optional): Whether or not to convert to grayscale before searching.
                 Defaults to False.
+            pyramid (int, optional): Number of pyramid levels used to search on a downscaled screen first
+                and refine the candidates at full resolution. 0 disables it. Defaults to `pyramid_levels`.
+            monitor (int, optional): Index of the monitor to search, as in `get_monitors`. The search region
+                is then relative to the monitor and limited to it. Defaults to None, the whole screen.
 
         Returns:
             element (NamedTuple): The element coordinates. None if not found.
         """
         self.state.element = None
-        screen_w, screen_h = self._fix_display_size()
-        x = x or 0
-        y = y or 0
-        w = width or screen_w
-        h = height or screen_h
-
-        region = (x, y, w, h)
+        region = self._search_region(x, y, width, height, monitor)
 
-        element_path = self._search_image_file(label)
-        element_path = self._image_path_as_image(element_path)
+        needle = self._load_template(label, grayscale)
+        pyramid = self._pyramid_levels if pyramid is None else pyramid
 
         if threshold:
             # TODO: Figure out how we should do threshold
@@ -378,31 +1271,19 @@ class DesktopBot(BaseBot):
                 "Warning: Ignoring best=False for now. It will be supported in the future."
             )
 
-        start_time = time.time()
+        tracker = self._new_change_tracker(incremental=True)
+        started = time.monotonic()
 
-        while True:
-            elapsed_time = (time.time() - start_time) * 1000
-            if elapsed_time > waiting_time:
-                return None
-
-            haystack = self.get_screenshot()
-            it = cv2find.locate_all_opencv(
-                element_path,
-                haystack_image=haystack,
-                region=region,
-                confidence=matching,
-                grayscale=grayscale,
-            )
-            try:
-                ele = next(it)
-            except StopIteration:
-                ele = None
+        for _ in self.polling.poll(waiting_time):
+            ele = self._find_element(label, needle, region, matching, grayscale, pyramid, tracker, started)
 
             if ele is not None:
                 ele = self._fix_retina_element(ele)
                 self.state.element = ele
                 return ele
 
+        return None
+
     def find_all(
         self,
         label: str,
@@ -415,6 +1296,8 @@ class DesktopBot(BaseBot):
         matching: float = 0.9,
         waiting_time: int = 10000,
         grayscale: bool = False,
+        pyramid: Optional[int] = None,
+        monitor: Optional[int] = None,
     ) -> Generator[cv2find.Box, Any, None]:
         """
         Find all elements defined by label on screen until a timeout happens.
@@ -433,82 +1316,54 @@ class DesktopBot(BaseBot):
                 Defaults to 10000ms (10s).
             grayscale (bool, optional): Whether or not to convert to grayscale before searching.
                 Defaults to False.
+            pyramid (int, optional): Number of pyramid levels used to search on a downscaled screen first
+                and refine the candidates at full resolution. 0 disables it. Defaults to `pyramid_levels`.
+            monitor (int, optional): Index of the monitor to search, as in `get_monitors`. The search region
+                is then relative to the monitor and limited to it. Defaults to None, the whole screen.
 
         Returns:
             elements (collections.Iterable[NamedTuple]): A generator with all element coordinates fount.
                 None if not found.
         """
 
-        def deduplicate(
-            elems: list[Generator[cv2find.Box, Any, None]]
-        ) -> list[Generator[cv2find.Box, Any, None]]:
-            def find_same(item, items):
-                x_start = item.left
-                x_end = item.left + item.width
-                y_start = item.top
-                y_end = item.top + item.height
-                similars = []
-                for itm in items:
-                    if itm == item:
-                        continue
-                    if (itm.left >= x_start and itm.left < x_end) and (
-                        itm.top >= y_start and itm.top < y_end
-                    ):
-                        similars.append(itm)
-                        continue
-                return similars
-
-            index = 0
-            while True:
-                try:
-                    dups = find_same(elems[index], elems[index:])
-                    for d in dups:
-                        elems.remove(d)
-                    index += 1
-                except IndexError:
-                    break
-            return elems
-
         self.state.element = None
-        screen_w, screen_h = self._fix_display_size()
-        x = x or 0
-        y = y or 0
-        w = width or screen_w
-        h = height or screen_h
+        region = self._search_region(x, y, width, height, monitor)
 
-        region = (x, y, w, h)
-
-        element_path = self._search_image_file(label)
-        element_path = self._image_path_as_image(element_path)
+        needle = self._load_template(label, grayscale)
+        pyramid = self._pyramid_levels if pyramid is None else pyramid
 
         if threshold:
             # TODO: Figure out how we should do threshold
             print("Threshold not yet supported")
 
-        start_time = time.time()
-
-        while True:
-            elapsed_time = (time.time() - start_time) * 1000
-            if elapsed_time > waiting_time:
-                return None
+        tracker = self._new_change_tracker(incremental=True)
+        started = time.monotonic()
 
-            haystack = self.get_screenshot()
+        for _ in self.polling.poll(waiting_time):
+            haystack, search_region, offset = self._grab_search_region(region, started, grayscale)
+            windows = self._search_windows(tracker, haystack, needle=needle)
+            if windows == []:
+                continue
             eles = cv2find.locate_all_opencv(
-                element_path,
+                needle,
                 haystack_image=haystack,
-                region=region,
+                region=search_region,
                 confidence=matching,
                 grayscale=grayscale,
+                offset=offset,
+                pyramid=pyramid,
+                windows=windows,
             )
+            eles = cv2find.non_max_suppression(list(eles))
             if not eles:
                 continue
-            eles = deduplicate(list(eles))
             for ele in eles:
                 if ele is not None:
                     ele = self._fix_retina_element(ele)
                     self.state.element = ele
                     yield ele
             break
+        return None
 
     def find_text(
         self,
@@ -601,6 +1456,16 @@ class DesktopBot(BaseBot):
         """
         return self.state.element
 
+    def get_monitors(self) -> List[display.Monitor]:
+        """
+        Returns the monitors which compose the screen.
+
+        Returns:
+            monitors (List[Monitor]): The index, position and size in pixels, whether or not it is the
+                primary monitor and the name of each monitor, sorted from left to right.
+        """
+        return display.get_monitors()
+
     def display_size(self) -> Tuple[int, int]:
         """
         Returns the display size in pixels.
@@ -615,32 +1480,58 @@ class DesktopBot(BaseBot):
         self,
         filepath: Optional[str] = None,
         region: Optional[Tuple[int, int, int, int]] = None,
+        monitor: Optional[int] = None,
     ) -> Image.Image:
         """
         Capture a screenshot.
 
         Args:
             filepath (str, optional): The filepath in which to save the screenshot. Defaults to None.
+                With `async_screenshots` the file is written in background.
             region (tuple, optional): Bounding box containing left, top, width and height to crop screenshot.
+            monitor (int, optional): Index of the monitor to capture, as in `get_monitors`. The region is then
+                relative to the monitor. Defaults to None, the whole screen.
 
         Returns:
             Image: The screenshot Image object
         """
-        if region:
-            x, y, width, height = region
-            width = x + width
-            height = y + height
-            region = (x, y, width, height)
-
-        img = ImageGrab.grab(bbox=region)
+        region = self._monitor_area(region, monitor)
+        img = capture.to_image(self.capture_backend.grab(region))
         if filepath:
-            img.save(filepath)
+            if self.async_screenshots:
+                self.screenshot_writer.submit(img.copy(), filepath)
+            else:
+                writer.save_image(img, filepath, config.SCREENSHOT_FORMAT, config.SCREENSHOT_COMPRESSION)
         return img
 
+    def screenshot_array(
+        self,
+        region: Optional[Tuple[int, int, int, int]] = None,
+        grayscale: bool = False,
+        out: Optional[ndarray] = None,
+        monitor: Optional[int] = None,
+    ) -> ndarray:
+        """
+        Capture a screenshot as an OpenCV array, without going through a PIL image.
+
+        Args:
+            region (tuple, optional): Bounding box containing left, top, width and height to crop screenshot.
+            grayscale (bool, optional): Whether or not to return a grayscale array. Defaults to False.
+            out (ndarray, optional): Preallocated uint8 array with the shape of the result to write the
+                screenshot to. Defaults to a new array.
+            monitor (int, optional): Index of the monitor to capture, as in `get_monitors`. The region is then
+                relative to the monitor. Defaults to None, the whole screen.
+
+        Returns:
+            ndarray: The height x width x 3 BGR array or height x width grayscale array.
+        """
+        return self._capture_array(self._monitor_area(region, monitor), grayscale, out)
+
     def get_screenshot(
         self,
         filepath: Optional[str] = None,
         region: Optional[Tuple[int, int, int, int]] = None,
+        monitor: Optional[int] = None,
     ) -> Image.Image:
         """
         Capture a screenshot.
@@ -648,11 +1539,13 @@ class DesktopBot(BaseBot):
         Args:
             filepath (str, optional): The filepath in which to save the screenshot. Defaults to None.
             region (tuple, optional): Bounding box containing left, top, width and height to crop screenshot.
+            monitor (int, optional): Index of the monitor to capture, as in `get_monitors`. The region is then
+                relative to the monitor. Defaults to None, the whole screen.
 
         Returns:
             Image: The screenshot Image object
         """
-        return self.screenshot(filepath, region)
+        return self.screenshot(filepath, region, monitor)
 
     def screen_cut(
         self,
@@ -730,21 +1623,10 @@ class DesktopBot(BaseBot):
                 "Warning: Ignoring best=False for now. It will be supported in the future."
             )
 
-        element_path = self._search_image_file(label)
-        element_path = self._image_path_as_image(element_path)
+        needle = self._load_template(label, False)
+        started = time.monotonic()
 
-        haystack = self.get_screenshot()
-        it = cv2find.locate_all_opencv(
-            element_path,
-            haystack_image=haystack,
-            region=region,
-            confidence=matching,
-            grayscale=False,
-        )
-        try:
-            ele = next(it)
-        except StopIteration:
-            ele = None
+        ele = self._find_element(label, needle, region, matching, False, self._pyramid_levels, since=started)
 
         if ele is None:
             return None, None
@@ -817,7 +1699,10 @@ class DesktopBot(BaseBot):
         x, y = self.get_element_coords_centered(label)
         if None in (x, y):
             raise ValueError(f"Element not available. Cannot find {label}.")
-        _mouse_click(self._mouse_controller, x, y)
+        _mouse_click(
+            self._mouse_controller, x, y,
+            wait_after_move=self._wait_after_action, move_delay=self.pacing.pre_click,
+        )
 
     def get_last_x(self) -> int:
         """
@@ -847,7 +1732,7 @@ class DesktopBot(BaseBot):
 
         """
         self._mouse_controller.position = (x, y)
-        self.sleep(config.DEFAULT_SLEEP_AFTER_ACTION)
+        self._wait_after_action(self.pacing.mouse)
 
     def click_at(self, x: int, y: int) -> None:
         """
@@ -857,12 +1742,15 @@ class DesktopBot(BaseBot):
             x (int): The X coordinate
             y (int): The Y coordinate
         """
-        _mouse_click(self._mouse_controller, x, y)
+        _mouse_click(
+            self._mouse_controller, x, y,
+            wait_after_move=self._wait_after_action, move_delay=self.pacing.pre_click,
+        )
 
     @only_if_element
     def click(
         self,
-        wait_after: int = config.DEFAULT_SLEEP_AFTER_ACTION,
+        wait_after: Optional[int] = None,
         *,
         clicks: int = 1,
         interval_between_clicks: int = 0,
@@ -873,6 +1761,7 @@ class DesktopBot(BaseBot):
 
         Args:
             wait_after (int, optional): Interval to wait after clicking on the element.
+                Defaults to the `pacing` profile.
             clicks (int, optional): Number of times to click. Defaults to 1.
             interval_between_clicks (int, optional): The interval between clicks in ms. Defaults to 0.
             button (str, optional): One of 'left', 'right', 'middle'. Defaults to 'left'
@@ -880,16 +1769,17 @@ class DesktopBot(BaseBot):
         x, y = self.state.center()
 
         _mouse_click(
-            self._mouse_controller, x, y, clicks, interval_between_clicks, button
+            self._mouse_controller, x, y, clicks, interval_between_clicks, button,
+            wait_after_move=self._wait_after_action, move_delay=self.pacing.pre_click,
         )
-        self.sleep(wait_after)
+        self._wait_after_action(self.pacing.post_click if wait_after is None else wait_after)
 
     @only_if_element
     def click_relative(
         self,
         x: int,
         y: int,
-        wait_after: int = config.DEFAULT_SLEEP_AFTER_ACTION,
+        wait_after: Optional[int] = None,
         *,
         clicks: int = 1,
         interval_between_clicks: int = 0,
@@ -902,6 +1792,7 @@ class DesktopBot(BaseBot):
             x (int): Horizontal offset
             y (int): Vertical offset
             wait_after (int, optional): Interval to wait after clicking on the element.
+                Defaults to the `pacing` profile.
             clicks (int, optional): Number of times to click. Defaults to 1.
             interval_between_clicks (int, optional): The interval between clicks in ms. Defaults to 0.
             button (str, optional): One of 'left', 'right', 'middle'. Defaults to 'left'
@@ -910,17 +1801,19 @@ class DesktopBot(BaseBot):
         y = self.state.y() + y
 
         _mouse_click(
-            self._mouse_controller, x, y, clicks, interval_between_clicks, button
+            self._mouse_controller, x, y, clicks, interval_between_clicks, button,
+            wait_after_move=self._wait_after_action, move_delay=self.pacing.pre_click,
         )
-        self.sleep(wait_after)
+        self._wait_after_action(self.pacing.post_click if wait_after is None else wait_after)
 
     @only_if_element
-    def double_click(self, wait_after: int = config.DEFAULT_SLEEP_AFTER_ACTION) -> None:
+    def double_click(self, wait_after: Optional[int] = None) -> None:
         """
         Double Click on the last found element.
 
         Args:
             wait_after (int, optional): Interval to wait after clicking on the element.
+                Defaults to the `pacing` profile.
         """
         self.click(wait_after=wait_after, clicks=2)
 
@@ -930,7 +1823,7 @@ class DesktopBot(BaseBot):
         x: int,
         y: int,
         interval_between_clicks: int = 0,
-        wait_after: int = config.DEFAULT_SLEEP_AFTER_ACTION,
+        wait_after: Optional[int] = None,
     ) -> None:
         """
         Double Click Relative on the last found element.
@@ -940,6 +1833,7 @@ class DesktopBot(BaseBot):
             y (int): Vertical offset
             interval_between_clicks (int, optional): The interval between clicks in ms. Defaults to 0.
             wait_after (int, optional): Interval to wait after clicking on the element.
+                Defaults to the `pacing` profile.
 
         """
         self.click_relative(
@@ -951,12 +1845,13 @@ class DesktopBot(BaseBot):
         )
 
     @only_if_element
-    def triple_click(self, wait_after: int = config.DEFAULT_SLEEP_AFTER_ACTION) -> None:
+    def triple_click(self, wait_after: Optional[int] = None) -> None:
         """
         Triple Click on the last found element.
 
         Args:
             wait_after (int, optional): Interval to wait after clicking on the element.
+                Defaults to the `pacing` profile.
         """
         self.click(wait_after=wait_after, clicks=3)
 
@@ -966,7 +1861,7 @@ class DesktopBot(BaseBot):
         x: int,
         y: int,
         interval_between_clicks: int = 0,
-        wait_after: int = config.DEFAULT_SLEEP_AFTER_ACTION,
+        wait_after: Optional[int] = None,
     ) -> None:
         """
         Triple Click Relative on the last found element.
@@ -976,6 +1871,7 @@ class DesktopBot(BaseBot):
             y (int): Vertical offset
             interval_between_clicks (int, optional): The interval between clicks in ms. Defaults to 0.
             wait_after (int, optional): Interval to wait after clicking on the element.
+                Defaults to the `pacing` profile.
 
         """
         self.click_relative(
@@ -988,7 +1884,7 @@ class DesktopBot(BaseBot):
 
     def mouse_down(
         self,
-        wait_after: int = config.DEFAULT_SLEEP_AFTER_ACTION,
+        wait_after: Optional[int] = None,
         *,
         button: str = "left",
     ) -> None:
@@ -996,16 +1892,17 @@ class DesktopBot(BaseBot):
         Holds down the requested mouse button.
 
         Args:
-            wait_after (int, optional): Interval to wait after clicking on the element.
+            wait_after (int, optional): Interval to wait after the action.
+                Defaults to the `pacing` profile.
             button (str, optional): One of 'left', 'right', 'middle'. Defaults to 'left'
         """
         mouse_button = mouse_map.get(button, None)
         self._mouse_controller.press(mouse_button)
-        self.sleep(wait_after)
+        self._wait_after_action(self.pacing.mouse if wait_after is None else wait_after)
 
     def mouse_up(
         self,
-        wait_after: int = config.DEFAULT_SLEEP_AFTER_ACTION,
+        wait_after: Optional[int] = None,
         *,
         button: str = "left",
     ) -> None:
@@ -1013,12 +1910,13 @@ class DesktopBot(BaseBot):
         Releases the requested mouse button.
 
         Args:
-            wait_after (int, optional): Interval to wait after clicking on the element.
+            wait_after (int, optional): Interval to wait after the action.
+                Defaults to the `pacing` profile.
             button (str, optional): One of 'left', 'right', 'middle'. Defaults to 'left'
         """
         mouse_button = mouse_map.get(button, None)
         self._mouse_controller.release(mouse_button)
-        self.sleep(wait_after)
+        self._wait_after_action(self.pacing.mouse if wait_after is None else wait_after)
 
     def scroll_down(self, clicks: int) -> None:
         """
@@ -1028,7 +1926,7 @@ class DesktopBot(BaseBot):
             clicks (int): Number of times to scroll down.
         """
         self._mouse_controller.scroll(0, -1 * clicks)
-        self.sleep(config.DEFAULT_SLEEP_AFTER_ACTION)
+        self._wait_after_action(self.pacing.scroll)
 
     def scroll_up(self, clicks: int) -> None:
         """
@@ -1038,7 +1936,7 @@ class DesktopBot(BaseBot):
             clicks (int): Number of times to scroll up.
         """
         self._mouse_controller.scroll(0, clicks)
-        self.sleep(config.DEFAULT_SLEEP_AFTER_ACTION)
+        self._wait_after_action(self.pacing.scroll)
 
     @only_if_element
     def move(self) -> None:
@@ -1047,7 +1945,7 @@ class DesktopBot(BaseBot):
         """
         x, y = self.state.center()
         self._mouse_controller.position = (x, y)
-        self.sleep(config.DEFAULT_SLEEP_AFTER_ACTION)
+        self._wait_after_action(self.pacing.mouse)
 
     def move_relative(self, x: int, y: int) -> None:
         """
@@ -1061,7 +1959,7 @@ class DesktopBot(BaseBot):
         x = self.get_last_x() + x
         y = self.get_last_y() + y
         self._mouse_controller.position = (x, y)
-        self.sleep(config.DEFAULT_SLEEP_AFTER_ACTION)
+        self._wait_after_action(self.pacing.mouse)
 
     def move_random(self, range_x: int, range_y: int) -> None:
         """
@@ -1075,12 +1973,12 @@ class DesktopBot(BaseBot):
         x = int(random.random() * range_x)
         y = int(random.random() * range_y)
         self._mouse_controller.position = (x, y)
-        self.sleep(config.DEFAULT_SLEEP_AFTER_ACTION)
+        self._wait_after_action(self.pacing.mouse)
 
     @only_if_element
     def right_click(
         self,
-        wait_after: int = config.DEFAULT_SLEEP_AFTER_ACTION,
+        wait_after: Optional[int] = None,
         *,
         clicks: int = 1,
         interval_between_clicks: int = 0,
@@ -1090,6 +1988,7 @@ class DesktopBot(BaseBot):
 
         Args:
             wait_after (int, optional): Interval to wait after clicking on the element.
+                Defaults to the `pacing` profile.
             clicks (int, optional): Number of times to click. Defaults to 1.
             interval_between_clicks (int, optional): The interval between clicks in ms. Defaults to 0.
         """
@@ -1101,8 +2000,10 @@ class DesktopBot(BaseBot):
             clicks,
             interval_between_clicks,
             button="right",
+            wait_after_move=self._wait_after_action,
+            move_delay=self.pacing.pre_click,
         )
-        self.sleep(wait_after)
+        self._wait_after_action(self.pacing.post_click if wait_after is None else wait_after)
 
     def right_click_at(self, x: int, y: int) -> None:
         """
@@ -1112,7 +2013,10 @@ class DesktopBot(BaseBot):
             x (int): The X coordinate
             y (int): The Y coordinate
         """
-        _mouse_click(self._mouse_controller, x, y, button="right")
+        _mouse_click(
+            self._mouse_controller, x, y, button="right",
+            wait_after_move=self._wait_after_action, move_delay=self.pacing.pre_click,
+        )
 
     @only_if_element
     def right_click_relative(
@@ -1120,7 +2024,7 @@ class DesktopBot(BaseBot):
         x: int,
         y: int,
         interval_between_clicks: int = 0,
-        wait_after: int = config.DEFAULT_SLEEP_AFTER_ACTION,
+        wait_after: Optional[int] = None,
     ) -> None:
         """
         Right Click Relative on the last found element.
@@ -1130,6 +2034,7 @@ class DesktopBot(BaseBot):
             y (int): Vertical offset
             interval_between_clicks (int, optional): The interval between clicks in ms. Defaults to 0.
             wait_after (int, optional): Interval to wait after clicking on the element.
+                Defaults to the `pacing` profile.
         """
         self.click_relative(
             x,
@@ -1159,15 +2064,35 @@ class DesktopBot(BaseBot):
         """
         Type a text char by char (individual key events).
 
+        With `bulk_typing` the events of the whole text are sent to the X server at once, unless an
+        interval is given.
+
         Args:
             text (str): text to be typed.
             interval (int, optional): interval (ms) between each key press. Defaults to 0
 
         """
-        for char in text:
-            self._kb_controller.type(char)
-            self.sleep(interval)
-        self.sleep(config.DEFAULT_SLEEP_AFTER_ACTION)
+        typer = self._bulk_typer() if self.bulk_typing else None
+        if typer is not None:
+            typer.type(text, interval)
+        elif interval:
+            for char in text:
+                self._kb_controller.type(char)
+                self.sleep(interval)
+        else:
+            self._kb_controller.type(text)
+        self._wait_after_action(self.pacing.keyboard)
+
+    def _bulk_typer(self) -> Optional[xtyping.XTestTyper]:
+        if self._typer is None:
+            self._typer = False
+            if xtyping.XTestTyper.available():
+                try:
+                    self._typer = xtyping.XTestTyper()
+                except Exception:
+                    # e.g. no XTEST extension, keep typing through pynput
+                    pass
+        return self._typer or None
 
     def paste(self, text: Optional[str] = None, wait: int = 0) -> None:
         """
@@ -1180,8 +2105,8 @@ class DesktopBot(BaseBot):
         if text:
             pyperclip.copy(text)
         self.control_v()
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.clipboard)
+        self._wait_after_action(delay)
 
     def copy_to_clipboard(self, text: str, wait: int = 0) -> None:
         """
@@ -1192,7 +2117,7 @@ class DesktopBot(BaseBot):
             wait (int, optional): Wait interval (ms) after task
         """
         pyperclip.copy(text)
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
+        delay = max(0, wait or self.pacing.clipboard)
         self.sleep(delay)
 
     def tab(self, wait: int = 0, presses: int = 1) -> None:
@@ -1204,10 +2129,10 @@ class DesktopBot(BaseBot):
             presses (int): Number of times to press the key. Defaults to 1.
 
         """
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
+        delay = max(0, wait or self.pacing.keyboard)
         for _ in range(presses):
             self._kb_controller.tap(Key.tab)
-            self.sleep(delay)
+            self._wait_after_action(delay)
 
     def enter(self, wait: int = 0, presses: int = 1) -> None:
         """
@@ -1218,10 +2143,10 @@ class DesktopBot(BaseBot):
             presses (int): Number of times to press the key. Defaults to 1.
 
         """
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
+        delay = max(0, wait or self.pacing.keyboard)
         for _ in range(presses):
             self._kb_controller.tap(Key.enter)
-            self.sleep(delay)
+            self._wait_after_action(delay)
 
     def key_right(self, wait: int = 0) -> None:
         """
@@ -1232,8 +2157,8 @@ class DesktopBot(BaseBot):
 
         """
         self._kb_controller.tap(Key.right)
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def key_enter(self, wait: int = 0) -> None:
         """
@@ -1254,8 +2179,8 @@ class DesktopBot(BaseBot):
 
         """
         self._kb_controller.tap(Key.end)
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def key_esc(self, wait: int = 0) -> None:
         """
@@ -1266,8 +2191,8 @@ class DesktopBot(BaseBot):
 
         """
         self._kb_controller.tap(Key.esc)
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def _key_fx(self, idx: KeyCode, wait: int = 0) -> None:
         """
@@ -1279,8 +2204,8 @@ class DesktopBot(BaseBot):
 
         """
         self._kb_controller.tap(idx)
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def key_f1(self, wait: int = 0) -> None:
         self._key_fx(Key.f1, wait=wait)
@@ -1327,7 +2252,7 @@ class DesktopBot(BaseBot):
 
         """
         self._kb_controller.press(Key.shift)
-        self.sleep(wait)
+        self._wait_after_action(wait)
 
     def release_shift(self) -> None:
         """
@@ -1335,7 +2260,7 @@ class DesktopBot(BaseBot):
         This method needs to be invoked after holding Shift or similar.
         """
         self._kb_controller.release(Key.shift)
-        self.sleep(config.DEFAULT_SLEEP_AFTER_ACTION)
+        self._wait_after_action(self.pacing.keyboard)
 
     def alt_space(self, wait: int = 0) -> None:
         """
@@ -1346,8 +2271,8 @@ class DesktopBot(BaseBot):
         """
         with self._kb_controller.pressed(Key.alt):
             self._kb_controller.tap(Key.space)
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def maximize_window(self) -> None:
         """
@@ -1355,7 +2280,7 @@ class DesktopBot(BaseBot):
         """
         with self._kb_controller.pressed(Key.alt, Key.space):
             self._kb_controller.tap("x")
-        self.sleep(config.DEFAULT_SLEEP_AFTER_ACTION)
+        self._wait_after_action(self.pacing.keyboard)
 
     def type_keys_with_interval(self, interval: int, keys: List) -> None:
         """
@@ -1404,8 +2329,8 @@ class DesktopBot(BaseBot):
         """
         with self._kb_controller.pressed(Key.alt):
             self._kb_controller.tap("e")
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def alt_r(self, wait: int = 0) -> None:
         """
@@ -1417,8 +2342,8 @@ class DesktopBot(BaseBot):
         """
         with self._kb_controller.pressed(Key.alt):
             self._kb_controller.tap("r")
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def alt_f(self, wait: int = 0) -> None:
         """
@@ -1430,8 +2355,8 @@ class DesktopBot(BaseBot):
         """
         with self._kb_controller.pressed(Key.alt):
             self._kb_controller.tap("f")
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def alt_u(self, wait: int = 0) -> None:
         """
@@ -1443,8 +2368,8 @@ class DesktopBot(BaseBot):
         """
         with self._kb_controller.pressed(Key.alt):
             self._kb_controller.tap("u")
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def alt_f4(self, wait: int = 0) -> None:
         """
@@ -1456,8 +2381,8 @@ class DesktopBot(BaseBot):
         """
         with self._kb_controller.pressed(Key.alt):
             self._kb_controller.tap(Key.f4)
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def control_c(self, wait: int = 0) -> str:
         """
@@ -1567,8 +2492,8 @@ class DesktopBot(BaseBot):
             key = Key.cmd
         with self._kb_controller.pressed(key):
             self._kb_controller.tap(key_to_press)
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def control_end(self, wait: int = 0) -> None:
         """
@@ -1613,8 +2538,8 @@ class DesktopBot(BaseBot):
             key_ctrl = Key.cmd
         with self._kb_controller.pressed(key_ctrl, Key.shift):
             self._kb_controller.tap("p")
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def control_shift_j(self, wait: int = 0) -> None:
         """
@@ -1629,8 +2554,8 @@ class DesktopBot(BaseBot):
             key_ctrl = Key.cmd
         with self._kb_controller.pressed(key_ctrl, Key.shift):
             self._kb_controller.tap("j")
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def shift_tab(self, wait: int = 0) -> None:
         """
@@ -1642,8 +2567,8 @@ class DesktopBot(BaseBot):
         """
         with self._kb_controller.pressed(Key.shift):
             self._kb_controller.tap(Key.tab)
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def get_clipboard(self) -> str:
         """
@@ -1663,8 +2588,8 @@ class DesktopBot(BaseBot):
 
         """
         self._kb_controller.tap(Key.left)
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def type_right(self, wait: int = 0) -> None:
         """
@@ -1675,8 +2600,8 @@ class DesktopBot(BaseBot):
 
         """
         self._kb_controller.tap(Key.right)
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def type_down(self, wait: int = 0) -> None:
         """
@@ -1687,8 +2612,8 @@ class DesktopBot(BaseBot):
 
         """
         self._kb_controller.tap(Key.down)
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def type_up(self, wait: int = 0) -> None:
         """
@@ -1698,8 +2623,8 @@ class DesktopBot(BaseBot):
             wait (int, optional): Wait interval (ms) after task
         """
         self._kb_controller.tap(Key.up)
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def type_windows(self, wait: int = 0) -> None:
         """
@@ -1709,8 +2634,8 @@ class DesktopBot(BaseBot):
             wait (int, optional): Wait interval (ms) after task
         """
         self._kb_controller.tap(Key.cmd)
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def page_up(self, wait: int = 0) -> None:
         """
@@ -1720,8 +2645,8 @@ class DesktopBot(BaseBot):
             wait (int, optional): Wait interval (ms) after task
         """
         self._kb_controller.tap(Key.page_up)
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def page_down(self, wait: int = 0) -> None:
         """
@@ -1731,8 +2656,8 @@ class DesktopBot(BaseBot):
             wait (int, optional): Wait interval (ms) after task
         """
         self._kb_controller.tap(Key.page_down)
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def space(self, wait: int = 0) -> None:
         """
@@ -1742,8 +2667,8 @@ class DesktopBot(BaseBot):
             wait (int, optional): Wait interval (ms) after task
         """
         self._kb_controller.tap(Key.space)
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def backspace(self, wait: int = 0) -> None:
         """
@@ -1753,8 +2678,8 @@ class DesktopBot(BaseBot):
             wait (int, optional): Wait interval (ms) after task
         """
         self._kb_controller.tap(Key.backspace)
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     def delete(self, wait: int = 0) -> None:
         """
@@ -1764,8 +2689,8 @@ class DesktopBot(BaseBot):
             wait (int, optional): Wait interval (ms) after task
         """
         self._kb_controller.tap(Key.delete)
-        delay = max(0, wait or config.DEFAULT_SLEEP_AFTER_ACTION)
-        self.sleep(delay)
+        delay = max(0, wait or self.pacing.keyboard)
+        self._wait_after_action(delay)
 
     ######
     # Misc
@@ -1783,15 +2708,10 @@ class DesktopBot(BaseBot):
         Returns
             status (bool): Whether or not the file was available before the timeout
         """
-        start_time = time.time()
-
-        while True:
-            elapsed_time = (time.time() - start_time) * 1000
-            if elapsed_time > timeout:
-                return False
+        for _ in self.polling.poll(timeout):
             if os.path.isfile(path) and os.access(path, os.R_OK):
                 return True
-            self.sleep(config.DEFAULT_SLEEP_AFTER_ACTION)
+        return False
 
     def execute(self, file_path: str) -> None:
         """
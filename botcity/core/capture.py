@@ -0,0 +1,341 @@
+"""
+Screen capture backends.
+
+A backend grabs the screen, or a region of it, either as a PIL image or as a numpy array.
+Backends are registered by name and `create_backend` picks the cheapest one available on the
+host when no name is given.
+"""
+import glob
+import os
+import platform
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Type, Union
+
+import cv2
+import numpy
+from PIL import Image, ImageGrab
+
+from . import xshm
+
+
+class CaptureBackend:
+    """
+    Base class of the screen capture backends.
+
+    Attributes:
+        name (str): The name used to select the backend.
+        supports_region (bool): Whether or not `grab` regions are expressed in screen pixels, so the
+            searches can capture only the area they need. Otherwise they capture the whole screen.
+        returns_array (bool): Whether or not `grab` returns a BGRA numpy array instead of a PIL image.
+        cost (int): Relative cost of a capture used to pick the backend, lower is faster.
+        auto (bool): Whether or not the backend can be picked automatically.
+    """
+    name = ""
+    supports_region = False
+    returns_array = False
+    cost = 100
+    auto = True
+
+    @classmethod
+    def available(cls) -> bool:
+        """
+        Whether or not the backend can be used on this host.
+        """
+        return True
+
+    def grab(self, region: Optional[Tuple[int, int, int, int]] = None) -> Union[Image.Image, numpy.ndarray]:
+        """
+        Capture the screen.
+
+        Args:
+            region (tuple, optional): Bounding box containing left, top, width and height to capture.
+                Defaults to the whole screen.
+
+        Returns:
+            frame (Image | numpy.ndarray): The captured frame.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Release the resources held by the backend.
+        """
+        pass
+
+
+class PILBackend(CaptureBackend):
+    """
+    Capture through `PIL.ImageGrab`, available on every platform.
+    """
+    name = "pil"
+    # On macOS the grab bounding box is expressed in points instead of pixels.
+    supports_region = platform.system() != "Darwin"
+    cost = 100
+
+    def grab(self, region: Optional[Tuple[int, int, int, int]] = None) -> Image.Image:
+        bbox = None
+        if region:
+            x, y, width, height = region
+            bbox = (x, y, x + width, y + height)
+        return ImageGrab.grab(bbox=bbox)
+
+
+class XShmBackend(CaptureBackend):
+    """
+    Capture through the X11 shared memory extension. See `xshm.XShmCapture`.
+
+    The arrays returned are views of the shared buffer, valid only until the next capture.
+    It is never picked automatically, select it by name, e.g. with `config.CAPTURE_BACKEND = "xshm"`.
+    """
+    name = "xshm"
+    supports_region = True
+    returns_array = True
+    cost = 10
+    auto = False
+
+    def __init__(self):
+        self._capture = xshm.XShmCapture()
+
+    @classmethod
+    def available(cls) -> bool:
+        return xshm.xdisplay is not None and platform.system() == "Linux" and bool(os.environ.get("DISPLAY"))
+
+    def grab(self, region: Optional[Tuple[int, int, int, int]] = None) -> numpy.ndarray:
+        return self._capture.grab(region)
+
+    def close(self) -> None:
+        self._capture.close()
+
+
+class ReplayBackend(CaptureBackend):
+    """
+    Replays frames recorded previously instead of capturing the screen.
+
+    Useful to test or benchmark the searches without a display.
+
+    Args:
+        source (str | Sequence): A directory with the frames, sorted by file name, or a sequence of
+            image file paths, PIL images or BGRA/BGR numpy arrays.
+        loop (bool, optional): Whether or not to restart after the last frame. Otherwise the last frame
+            is repeated. Defaults to True.
+    """
+    name = "replay"
+    supports_region = True
+    cost = 0
+    auto = False
+
+    def __init__(self, source: Union[str, Sequence], loop: bool = True):
+        if isinstance(source, str):
+            source = sorted(
+                path for path in glob.glob(os.path.join(source, "*"))
+                if os.path.splitext(path)[1].lower() in (".png", ".bmp", ".jpg", ".jpeg")
+            )
+        if not source:
+            raise ValueError("No frames to replay.")
+        self._frames = list(source)
+        self._loop = loop
+        self._index = 0
+
+    def grab(self, region: Optional[Tuple[int, int, int, int]] = None) -> Union[Image.Image, numpy.ndarray]:
+        frame = self._frames[self._index]
+        if self._index + 1 < len(self._frames):
+            self._index += 1
+        elif self._loop:
+            self._index = 0
+
+        if isinstance(frame, str):
+            frame = Image.open(frame)
+        if not region:
+            return frame
+        x, y, width, height = region
+        if isinstance(frame, numpy.ndarray):
+            return frame[y:y + height, x:x + width]
+        return frame.crop((x, y, x + width, y + height))
+
+
+_BACKENDS: Dict[str, Type[CaptureBackend]] = {}
+
+
+def register_backend(backend: Type[CaptureBackend]) -> Type[CaptureBackend]:
+    """
+    Register a capture backend under its name. Can be used as a class decorator.
+
+    Args:
+        backend (type): The CaptureBackend subclass.
+
+    Returns:
+        backend (type): The same class.
+    """
+    if not backend.name:
+        raise ValueError("Capture backends must have a name.")
+    _BACKENDS[backend.name] = backend
+    return backend
+
+
+def get_backend_class(name: str) -> Type[CaptureBackend]:
+    """
+    The capture backend registered under name.
+
+    Args:
+        name (str): The backend name.
+
+    Returns:
+        backend (type): The CaptureBackend subclass.
+    """
+    try:
+        return _BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown capture backend '{name}'. Options are: {', '.join(sorted(_BACKENDS))}.")
+
+
+def available_backends() -> List[str]:
+    """
+    The names of the backends which can be picked automatically on this host, cheapest first.
+
+    Returns:
+        names (list): The backend names.
+    """
+    backends = [backend for backend in _BACKENDS.values() if backend.auto and backend.available()]
+    return [backend.name for backend in sorted(backends, key=lambda backend: backend.cost)]
+
+
+def create_backend(name: Optional[str] = None, **kwargs) -> CaptureBackend:
+    """
+    Create a capture backend.
+
+    Args:
+        name (str, optional): The backend name. Defaults to None, which picks the cheapest backend
+            available that can be created.
+        **kwargs: Arguments for the backend constructor.
+
+    Returns:
+        backend (CaptureBackend): The capture backend.
+    """
+    if name is not None:
+        return get_backend_class(name)(**kwargs)
+
+    for candidate in available_backends():
+        try:
+            return _BACKENDS[candidate]()
+        except Exception:
+            # e.g. no connection to the display server, try the next one
+            continue
+    raise RuntimeError("No screen capture backend available.")
+
+
+def to_image(frame: Union[Image.Image, numpy.ndarray]) -> Image.Image:
+    """
+    Convert a frame returned by a backend to a PIL RGB image.
+
+    Args:
+        frame (Image | numpy.ndarray): The frame. Arrays are expected in BGR or BGRA order.
+
+    Returns:
+        image (Image): The PIL image.
+    """
+    if isinstance(frame, Image.Image):
+        return frame
+    if frame.ndim == 2:
+        return Image.fromarray(frame)
+    return Image.fromarray(numpy.ascontiguousarray(frame[:, :, 2::-1]))
+
+
+# cvtColor codes from the source layout to (BGR, grayscale). None means no conversion.
+_CONVERSIONS = {
+    "RGB": (cv2.COLOR_RGB2BGR, cv2.COLOR_RGB2GRAY),
+    "RGBA": (cv2.COLOR_RGBA2BGR, cv2.COLOR_RGBA2GRAY),
+    "L": (cv2.COLOR_GRAY2BGR, None),
+    "BGR": (None, cv2.COLOR_BGR2GRAY),
+    "BGRA": (cv2.COLOR_BGRA2BGR, cv2.COLOR_BGRA2GRAY),
+    "GRAY": (cv2.COLOR_GRAY2BGR, None),
+}
+
+
+def to_array(
+    frame: Union[Image.Image, numpy.ndarray],
+    region: Optional[Tuple[int, int, int, int]] = None,
+    grayscale: bool = False,
+    out: Optional[numpy.ndarray] = None,
+) -> numpy.ndarray:
+    """
+    Convert a frame returned by a backend to an OpenCV BGR or grayscale array.
+
+    The region is sliced before converting and the pixels are copied only once, straight into out
+    when given. The result never shares memory with the frame.
+
+    Args:
+        frame (Image | numpy.ndarray): The frame. Arrays are expected in BGR, BGRA or grayscale.
+        region (tuple, optional): Bounding box containing left, top, width and height to keep.
+            Defaults to the whole frame.
+        grayscale (bool, optional): Whether or not to convert to grayscale. Defaults to False.
+        out (numpy.ndarray, optional): The array to write the result to. It must have the shape of the
+            result and dtype uint8. Defaults to a new array.
+
+    Returns:
+        array (numpy.ndarray): The height x width x 3 BGR array or height x width grayscale array.
+    """
+    if isinstance(frame, Image.Image):
+        if frame.mode not in ("RGB", "RGBA", "L"):
+            frame = frame.convert("RGB")
+        layout = frame.mode
+        frame = numpy.asarray(frame)
+    elif frame.ndim == 2:
+        layout = "GRAY"
+    else:
+        layout = "BGRA" if frame.shape[2] == 4 else "BGR"
+
+    if region:
+        x, y, width, height = region
+        frame = frame[y:y + height, x:x + width]
+
+    shape = frame.shape[:2] if grayscale else frame.shape[:2] + (3,)
+    if out is not None and (out.shape != shape or out.dtype != numpy.uint8):
+        raise ValueError(f"The output array must have shape {shape} and dtype uint8.")
+
+    code = _CONVERSIONS[layout][1 if grayscale else 0]
+    if code is None:
+        if out is None:
+            return frame.copy()
+        numpy.copyto(out, frame)
+        return out
+    if out is None:
+        return cv2.cvtColor(frame, code)
+    return cv2.cvtColor(frame, code, dst=out)
+
+
+def benchmark(
+    names: Optional[Sequence[str]] = None,
+    frames: int = 30,
+    region: Optional[Tuple[int, int, int, int]] = None,
+) -> Dict[str, float]:
+    """
+    Measure how many frames per second each backend captures.
+
+    Args:
+        names (Sequence[str], optional): The backends to measure. Defaults to the available ones.
+        frames (int, optional): Number of frames captured by each backend. Defaults to 30.
+        region (tuple, optional): The region to capture. Defaults to the whole screen.
+
+    Returns:
+        results (dict): The frames per second of each backend. Backends which failed are left out.
+    """
+    results = {}
+    for name in names or available_backends():
+        try:
+            backend = create_backend(name)
+        except Exception:
+            continue
+        try:
+            backend.grab(region)
+            start = time.perf_counter()
+            for _ in range(frames):
+                backend.grab(region)
+            results[name] = frames / (time.perf_counter() - start)
+        finally:
+            backend.close()
+    return results
+
+
+register_backend(PILBackend)
+register_backend(XShmBackend)
+register_backend(ReplayBackend)
@@ -1,2 +1,82 @@
-
 DEFAULT_SLEEP_AFTER_ACTION = 300
+
+# Pause (ms) between moving the mouse and clicking.
+DEFAULT_SLEEP_BEFORE_CLICK = 100
+
+# How long (ms) a display size read from a screenshot is reused on platforms in which
+# resolution changes cannot be observed.
+DISPLAY_SIZE_CACHE_TTL = 1000
+
+# Maximum number of preprocessed templates kept in memory by each bot.
+TEMPLATE_CACHE_SIZE = 128
+
+# Number of threads used by each bot to match templates in parallel.
+# None uses the number of CPUs available.
+MATCHING_WORKERS = None
+
+# Number of pyramid levels used by default for coarse-to-fine searches. 0 disables it.
+PYRAMID_LEVELS = 0
+
+# Whether or not the find methods search first around the last location of each element and
+# the padding (px) added around it.
+USE_LOCATION_HINTS = False
+LOCATION_HINT_PADDING = 100
+
+# Pacing of the wait loops (find, find_all, wait_for_file...): interval (ms) after the first
+# attempt, maximum interval (ms), growth factor and the fraction of one CPU core the attempts
+# may use (None for no limit).
+POLLING_MIN_INTERVAL = 50
+POLLING_MAX_INTERVAL = 250
+POLLING_BACKOFF = 1.5
+POLLING_CPU_BUDGET = None
+
+# Whether or not the wait loops skip template matching when a new screenshot is identical
+# to the previous one.
+SKIP_UNCHANGED_FRAMES = True
+
+# Whether or not find_until and find_all search only the areas of the screen which changed
+# since the previous attempt, at the cost of copying and comparing every frame captured.
+# Requires SKIP_UNCHANGED_FRAMES.
+INCREMENTAL_SEARCH = False
+
+# Name of the screen capture backend (see capture.py), e.g. "xshm" on X11. None picks the cheapest one
+# available among the backends which can be picked automatically.
+CAPTURE_BACKEND = None
+
+# Background frame grabber: target frames per second and number of frames kept in the ring buffer.
+FRAME_GRABBER_FPS = 30
+FRAME_GRABBER_SLOTS = 3
+
+# Screenshots saved to a file: format (None uses the file extension), compression level (zlib level
+# for PNG, quality for JPEG, None uses the Pillow default) and whether they are written on
+# background threads, how many and how many screenshots may wait to be written.
+SCREENSHOT_FORMAT = None
+SCREENSHOT_COMPRESSION = None
+ASYNC_SCREENSHOTS = False
+SCREENSHOT_WRITER_WORKERS = 2
+SCREENSHOT_WRITER_QUEUE_SIZE = 8
+
+# Session recorder: frames per second, frames between keyframes, side (px) of the tiles compared
+# between frames, zlib compression level and time (ms) a frame may take to encode before the next
+# frames are dropped (None means no limit).
+RECORDER_FPS = 5
+RECORDER_KEYFRAME_INTERVAL = 100
+RECORDER_TILE_SIZE = 32
+RECORDER_COMPRESSION = 1
+RECORDER_FRAME_BUDGET = 50
+
+# Settle mode: the waits after the mouse and keyboard actions end once the screen did not change for
+# SETTLE_STABLE_TIME (ms), checked every SETTLE_INTERVAL (ms), and never before SETTLE_MIN_WAIT (ms) so
+# the application has time to start repainting. SETTLE_REGION_SIZE is the side (px) of the area around
+# the mouse which is watched, None watches the whole screen.
+SETTLE_AFTER_ACTION = False
+SETTLE_STABLE_TIME = 50
+SETTLE_INTERVAL = 15
+SETTLE_MIN_WAIT = 100
+SETTLE_REGION_SIZE = 400
+
+# Name of the pacing preset (see pacing.py) used by new bots for the waits after each action.
+PACING_PRESET = "default"
+
+# Whether or not kb_type sends the key events of the whole text at once through XTEST on X11.
+BULK_TYPING = False
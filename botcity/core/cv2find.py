@@ -32,10 +32,17 @@ OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
 
 import collections
+import functools
+import os
+import threading
+import zlib
 import cv2
 import numpy
+from PIL import Image as PILImage
 from PIL.Image import Image
-from typing import Union, Tuple, Optional, Generator, Any
+from typing import Union, Tuple, Optional, Generator, Any, List, Sequence, Callable
+
+from . import config
 
 RUNNING_CV_2 = cv2.__version__[0] < "3"
 
@@ -48,6 +55,21 @@ else:
     LOAD_COLOR = cv2.IMREAD_COLOR
     LOAD_GRAYSCALE = cv2.IMREAD_GRAYSCALE
 
+# Number of boxes above which non_max_suppression buckets the boxes in a grid by default.
+NMS_GRID_MIN_BOXES = 500
+
+# Pyramid search: smallest needle side (px) allowed at the coarsest level, how much the
+# confidence is relaxed to select candidates at the coarse level and the fraction of coarse
+# positions above which refining is not worth it and a full resolution search is done instead.
+PYRAMID_MIN_NEEDLE_SIZE = 8
+PYRAMID_COARSE_MARGIN = 0.2
+PYRAMID_MAX_CANDIDATE_RATIO = 0.05
+
+# Incremental search: side (px) of the tiles compared between consecutive frames and the
+# fraction of the frame above which the changed areas are not worth searching separately.
+DIRTY_TILE_SIZE = 32
+DIRTY_MAX_AREA_RATIO = 0.5
+
 
 def _load_cv2(
     img: Union[Image, numpy.ndarray, str], grayscale: bool = False
@@ -60,7 +82,9 @@ def _load_cv2(
     # RGBA: load with -1 * cv2.CV_LOAD_IMAGE_COLOR to preserve alpha
     # to matchTemplate, need template and image to be the same wrt having alpha
 
-    if isinstance(img, str):
+    if isinstance(img, Haystack):
+        img_cv = img.gray if grayscale else img.bgr
+    elif isinstance(img, str):
         # The function imread loads an image from the specified file and
         # returns it. If the image cannot be read (because of missing
         # file, improper permissions, unsupported or invalid format),
@@ -77,8 +101,11 @@ def _load_cv2(
                 "unsupported or invalid format" % img
             )
     elif isinstance(img, numpy.ndarray):
+        if len(img.shape) == 3 and img.shape[2] == 4:
+            # BGRA frames, e.g. from XShmCapture
+            img_cv = cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY if grayscale else cv2.COLOR_BGRA2BGR)
         # don't try to convert an already-gray image to gray
-        if grayscale and len(img.shape) == 3:  # and img.shape[2] == 3:
+        elif grayscale and len(img.shape) == 3:  # and img.shape[2] == 3:
             img_cv = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
         else:
             img_cv = img
@@ -89,10 +116,416 @@ def _load_cv2(
         if grayscale:
             img_cv = cv2.cvtColor(img_cv, cv2.COLOR_BGR2GRAY)
     else:
-        raise TypeError("expected an image filename, OpenCV numpy array, or PIL image")
+        raise TypeError("expected an image filename, OpenCV numpy array, PIL image or Haystack")
     return img_cv
 
 
+class Haystack:
+    """
+    An image converted once to OpenCV format so it can be searched by many needles.
+
+    The BGR view is computed when the haystack is created, the grayscale view and the
+    downscaled levels of the pyramid search on their first use.
+
+    Args:
+        image (Image | numpy.ndarray | str): The image to be searched.
+    """
+
+    def __init__(self, image: Union[Image, numpy.ndarray, str]):
+        self._bgr = _load_cv2(image)
+        self._gray = None
+        self._levels = {}
+        self._lock = threading.Lock()
+
+    @property
+    def bgr(self) -> numpy.ndarray:
+        """
+        The BGR view of the image.
+        """
+        return self._bgr
+
+    @property
+    def gray(self) -> numpy.ndarray:
+        """
+        The grayscale view of the image.
+        """
+        if self._gray is None:
+            with self._lock:
+                if self._gray is None:
+                    self._gray = _load_cv2(self._bgr, grayscale=True)
+        return self._gray
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """
+        The image width and height in pixels.
+        """
+        height, width = self._bgr.shape[:2]
+        return width, height
+
+    def downscaled(self, levels: int, grayscale: bool = False) -> numpy.ndarray:
+        """
+        The image downscaled by 2**levels, as used by the pyramid search.
+
+        Args:
+            levels (int): The number of pyramid levels.
+            grayscale (bool, optional): Whether or not to downscale the grayscale view. Defaults to False.
+
+        Returns:
+            image (numpy.ndarray): The downscaled image.
+        """
+        key = (levels, grayscale)
+        small = self._levels.get(key)
+        if small is None:
+            small = _downscale(self.gray if grayscale else self._bgr, levels)
+            with self._lock:
+                small = self._levels.setdefault(key, small)
+        return small
+
+
+class TemplateCache:
+    """
+    Bounded LRU cache of templates (needles) ready to be matched.
+
+    Entries are keyed by the image path and the color mode and are reloaded when the
+    modification time of the file changes.
+
+    Args:
+        maxsize (int, optional): Maximum number of templates to keep.
+            Defaults to `config.TEMPLATE_CACHE_SIZE`.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self._maxsize = config.TEMPLATE_CACHE_SIZE if maxsize is None else maxsize
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        """
+        Maximum number of templates kept in the cache.
+        """
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int):
+        with self._lock:
+            self._maxsize = maxsize
+            self._trim()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: str, grayscale: bool = False) -> numpy.ndarray:
+        """
+        Return the template stored at path converted to OpenCV format.
+
+        Args:
+            path (str): The path for the image on disk.
+            grayscale (bool, optional): Whether or not the template is converted to grayscale.
+                Defaults to False.
+
+        Returns:
+            template (numpy.ndarray): The read-only template array.
+        """
+        mtime = os.stat(path).st_mtime_ns
+        key = (path, grayscale)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == mtime:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        with PILImage.open(path) as img:
+            template = _load_cv2(img, grayscale)
+        template.flags.writeable = False
+
+        with self._lock:
+            self._entries[key] = (mtime, template)
+            self._entries.move_to_end(key)
+            self._trim()
+        return template
+
+    def clear(self) -> None:
+        """
+        Remove all templates and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _trim(self):
+        while len(self._entries) > max(self._maxsize, 0):
+            self._entries.popitem(last=False)
+
+
+class LocationHints:
+    """
+    Last location in which each element was found.
+
+    Used to search a small window around the previous hit before searching the whole region.
+
+    Args:
+        padding (int, optional): Pixels added around the last hit to build the search window.
+            Defaults to `config.LOCATION_HINT_PADDING`.
+    """
+
+    def __init__(self, padding: Optional[int] = None):
+        self.padding = config.LOCATION_HINT_PADDING if padding is None else padding
+        self._boxes = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Fraction of the hinted searches in which the element was found inside the window.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def window(
+        self, key: Any, region: Tuple[int, int, int, int], size: Tuple[int, int]
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        The search window around the last hit of key.
+
+        Args:
+            key (Any): The element identifier.
+            region (tuple): The search region (left, top, width, height) which bounds the window.
+            size (tuple): The width and height of the element being searched.
+
+        Returns:
+            window (tuple): The window (left, top, width, height). None if there is no hint or
+                the element does not fit in it.
+        """
+        box = self._boxes.get(key)
+        if box is None:
+            return None
+        left = max(box.left - self.padding, region[0])
+        top = max(box.top - self.padding, region[1])
+        right = min(box.left + box.width + self.padding, region[0] + region[2])
+        bottom = min(box.top + box.height + self.padding, region[1] + region[3])
+        if right - left < size[0] or bottom - top < size[1]:
+            return None
+        return left, top, right - left, bottom - top
+
+    def update(self, key: Any, box: Box) -> None:
+        """
+        Store the location of the last hit of key.
+        """
+        with self._lock:
+            self._boxes[key] = box
+
+    def record(self, hit: bool) -> None:
+        """
+        Count the outcome of a hinted search.
+        """
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self) -> None:
+        """
+        Remove all hints and reset the counters.
+        """
+        with self._lock:
+            self._boxes.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def frame_fingerprint(image: Union[Image, numpy.ndarray, Haystack]) -> Tuple[Any, int]:
+    """
+    Cheap checksum of the pixels of an image used to detect frames that did not change.
+
+    Args:
+        image (Image | numpy.ndarray | Haystack): The frame.
+
+    Returns:
+        fingerprint (tuple): The frame shape and the CRC32 of its pixels.
+    """
+    if isinstance(image, Haystack):
+        image = image.bgr
+    if isinstance(image, numpy.ndarray):
+        return image.shape, zlib.crc32(numpy.ascontiguousarray(image))
+    return (image.size, image.mode), zlib.crc32(image.tobytes())
+
+
+def _frame_array(image: Union[Image, numpy.ndarray, Haystack]) -> numpy.ndarray:
+    if isinstance(image, Haystack):
+        image = image.bgr
+    if isinstance(image, numpy.ndarray):
+        return image
+    return numpy.asarray(image)
+
+
+def dirty_regions(
+    previous: Union[Image, numpy.ndarray, Haystack],
+    current: Union[Image, numpy.ndarray, Haystack],
+    padding: Tuple[int, int] = (0, 0),
+    tile: int = DIRTY_TILE_SIZE,
+) -> Optional[List[Tuple[int, int, int, int]]]:
+    """
+    Areas of current which differ from previous.
+
+    The frames are compared in tiles and neighbouring changed tiles are merged into a single area.
+    Each area is grown by padding and clipped to the frame, so with a padding of the needle size
+    minus one every position where the needle overlaps a change is inside one of the areas.
+
+    Args:
+        previous (Image | numpy.ndarray | Haystack): The previous frame.
+        current (Image | numpy.ndarray | Haystack): The new frame.
+        padding (tuple, optional): Horizontal and vertical padding (px). Defaults to (0, 0).
+        tile (int, optional): The tile side (px). Defaults to `DIRTY_TILE_SIZE`.
+
+    Returns:
+        regions (list): The (left, top, width, height) of the changed areas. Empty when the frames are
+            identical. None when the frames cannot be compared or most of the frame changed.
+    """
+    previous = _frame_array(previous)
+    current = _frame_array(current)
+    if previous.shape != current.shape:
+        return None
+
+    height, width = current.shape[:2]
+    diff = previous != current
+    if diff.ndim == 3:
+        diff = diff.any(axis=2)
+
+    rows, cols = -(-height // tile), -(-width // tile)
+    grid = numpy.zeros((rows * tile, cols * tile), dtype=bool)
+    grid[:height, :width] = diff
+    tiles = grid.reshape(rows, tile, cols, tile).any(axis=(1, 3)).astype(numpy.uint8)
+    if not tiles.any():
+        return []
+
+    _, _, stats, _ = cv2.connectedComponentsWithStats(tiles, connectivity=8)
+    regions = []
+    area = 0
+    for left, top, w, h, _ in stats[1:].tolist():
+        x0, y0 = max(left * tile - padding[0], 0), max(top * tile - padding[1], 0)
+        x1 = min((left + w) * tile + padding[0], width)
+        y1 = min((top + h) * tile + padding[1], height)
+        regions.append((x0, y0, x1 - x0, y1 - y0))
+        area += (x1 - x0) * (y1 - y0)
+    if area > DIRTY_MAX_AREA_RATIO * width * height:
+        return None
+    return regions
+
+
+class ChangeTracker:
+    """
+    Remembers the last frame captured by a search for each capture area so frames that did not
+    change can be skipped.
+
+    Args:
+        keep_frames (bool, optional): Whether or not to keep a copy of the frames so `search_windows`
+            can return the areas which changed instead of only detecting identical frames.
+            Defaults to False.
+    """
+
+    def __init__(self, keep_frames: bool = False):
+        self.keep_frames = keep_frames
+        self._fingerprints = {}
+        self._frames = {}
+
+    def changed(self, image: Union[Image, numpy.ndarray, Haystack], key: Any = None) -> bool:
+        """
+        Whether or not the frame differs from the previous one captured for key.
+
+        Args:
+            image (Image | numpy.ndarray | Haystack): The new frame.
+            key (Any, optional): The capture area identifier. Defaults to None.
+
+        Returns:
+            changed (bool): False if the frame is identical to the previous one.
+        """
+        fingerprint = frame_fingerprint(image)
+        previous = self._fingerprints.get(key)
+        self._fingerprints[key] = fingerprint
+        return fingerprint != previous
+
+    def search_windows(
+        self,
+        image: Union[Image, numpy.ndarray, Haystack],
+        key: Any = None,
+        padding: Tuple[int, int] = (0, 0),
+    ) -> Optional[List[Tuple[int, int, int, int]]]:
+        """
+        The areas of the frame which must be searched again.
+
+        Only valid when nothing was found in the previous frame captured for key, as the areas which
+        did not change would yield the same result.
+
+        Args:
+            image (Image | numpy.ndarray | Haystack): The new frame.
+            key (Any, optional): The capture area identifier. Defaults to None.
+            padding (tuple, optional): Horizontal and vertical padding (px) of the changed areas,
+                usually the needle size minus one. Defaults to (0, 0).
+
+        Returns:
+            windows (list): The (left, top, width, height) of the areas to search. Empty when the frame
+                did not change. None when the whole frame must be searched.
+        """
+        if not self.keep_frames:
+            return None if self.changed(image, key) else []
+
+        frame = _frame_array(image)
+        if frame is image or isinstance(image, Haystack):
+            frame = frame.copy()
+        previous = self._frames.get(key)
+        self._frames[key] = frame
+        if previous is None:
+            return None
+        return dirty_regions(previous, frame, padding)
+
+
+class SearchStats:
+    """
+    Counters of the frames processed by the search loops.
+
+    Attributes:
+        frames (int): Number of frames captured.
+        skipped (int): Number of frames in which matching was skipped because they did not change.
+        partial (int): Number of frames in which only the areas which changed were searched.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.frames = 0
+        self.skipped = 0
+        self.partial = 0
+
+    def record(self, skipped: bool, partial: bool = False) -> None:
+        """
+        Count a frame.
+        """
+        with self._lock:
+            self.frames += 1
+            if skipped:
+                self.skipped += 1
+            elif partial:
+                self.partial += 1
+
+    def reset(self) -> None:
+        """
+        Reset the counters.
+        """
+        with self._lock:
+            self.frames = 0
+            self.skipped = 0
+            self.partial = 0
+
+
 def locate_all_opencv(
     needle_image: Union[Image, numpy.ndarray, str],
     haystack_image: Union[Image, numpy.ndarray, str],
@@ -101,6 +534,9 @@ def locate_all_opencv(
     region: Optional[Tuple[int, int, int, int]] = None,
     step: int = 1,
     confidence: float = 0.999,
+    offset: Tuple[int, int] = (0, 0),
+    pyramid: int = 0,
+    windows: Optional[Sequence[Tuple[int, int, int, int]]] = None,
 ) -> Generator[Box, Any, None]:
     """
     TODO - rewrite this
@@ -111,12 +547,28 @@ def locate_all_opencv(
         limitations:
           - OpenCV 3.x & python 3.x not tested
           - RGBA images are treated as RBG (ignores alpha channel)
+        offset is added to the coordinates of every box found and is used when the
+        haystack is a crop of a larger image (e.g. a screenshot of the search region only).
+        the boxes are yielded by descending score and limit keeps the best ones, so
+        limit=1 returns only the best match.
+        pyramid > 0 matches first on the haystack and needle downscaled by 2**pyramid and
+            then refines only small windows around the candidates at full resolution,
+            so the scores are exact. step is ignored when the pyramid is used. When the
+            needle is too small or the coarse level is not selective it falls back to a
+            full resolution search.
+        windows restricts the search to the positions where the needle fits inside one of the
+            given (left, top, width, height) areas of the haystack, e.g. the dirty_regions
+            between two frames. step and pyramid are ignored when windows are given.
     """
 
     confidence = float(confidence)
 
     needle_image = _load_cv2(needle_image, grayscale)
     needle_height, needle_width = needle_image.shape[:2]
+    downscale = None
+    if isinstance(haystack_image, Haystack) and not region:
+        # Share the downscaled levels among all the needles searched on the haystack
+        downscale = functools.partial(haystack_image.downscaled, grayscale=grayscale)
     haystack_image = _load_cv2(haystack_image, grayscale)
 
     if region:
@@ -135,29 +587,285 @@ def locate_all_opencv(
             "needle dimension(s) exceed the haystack image or region dimensions"
         )
 
-    if step == 2:
-        confidence *= 0.95
-        needle_image = needle_image[::step, ::step]
-        haystack_image = haystack_image[::step, ::step]
-    else:
+    matches = None
+    if windows is not None:
+        # windows are expressed in haystack coordinates, move them inside the region
+        windows = [(left - region[0], top - region[1], width, height) for left, top, width, height in windows]
+        matches = _match_windows(haystack_image, needle_image, confidence, windows)
+    elif pyramid > 0:
+        matches = _match_pyramid(haystack_image, needle_image, confidence, pyramid, downscale)
+
+    if matches is not None:
+        matchy, matchx, scores = matches
+        match_indices = _top_matches(scores, confidence, limit)
+        matchy, matchx = matchy[match_indices], matchx[match_indices]
         step = 1
+    else:
+        if step == 2:
+            confidence *= 0.95
+            needle_image = needle_image[::step, ::step]
+            haystack_image = haystack_image[::step, ::step]
+        else:
+            step = 1
 
-    # get all matches at once, credit:
-    # https://stackoverflow.com/questions/7670112/finding-a-subimage-inside-a-numpy-image/9253805#9253805
-    result = cv2.matchTemplate(haystack_image, needle_image, cv2.TM_CCOEFF_NORMED)
-    match_indices = numpy.arange(result.size)[(result > confidence).flatten()]
-    matches = numpy.unravel_index(match_indices[:limit], result.shape)
+        # get all matches at once, credit:
+        # https://stackoverflow.com/questions/7670112/finding-a-subimage-inside-a-numpy-image/9253805#9253805
+        result = cv2.matchTemplate(haystack_image, needle_image, cv2.TM_CCOEFF_NORMED)
+        match_indices = _top_matches(result.ravel(), confidence, limit)
+        matchy, matchx = numpy.unravel_index(match_indices, result.shape)
 
-    if len(matches[0]) == 0:
+    if len(match_indices) == 0:
         return
 
     # use a generator for API consistency:
-    matchx = matches[1] * step + region[0]  # vectorized
-    matchy = matches[0] * step + region[1]
-
-    # Order results before sending back
-    ordered = sorted(
-        zip(matchx, matchy), key=lambda p: result[p[1]][p[0]], reverse=True
-    )
-    for x, y in ordered:
+    matchx = matchx * step + region[0] + offset[0]  # vectorized
+    matchy = matchy * step + region[1] + offset[1]
+
+    for x, y in zip(matchx.tolist(), matchy.tolist()):
         yield Box(x, y, needle_width, needle_height)
+
+
+def _downscale(image: numpy.ndarray, levels: int) -> numpy.ndarray:
+    scale = 1 << levels
+    height, width = image.shape[:2]
+    return cv2.resize(image, (width // scale, height // scale), interpolation=cv2.INTER_AREA)
+
+
+def _match_pyramid(
+    haystack: numpy.ndarray,
+    needle: numpy.ndarray,
+    confidence: float,
+    levels: int,
+    downscale: Optional[Callable[[int], numpy.ndarray]] = None,
+) -> Optional[Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]]:
+    """
+    Coarse-to-fine template matching.
+
+    Args:
+        haystack (numpy.ndarray): The image to search.
+        needle (numpy.ndarray): The template to look for.
+        confidence (float): The minimum score (exclusive) to consider a match.
+        levels (int): The number of pyramid levels. The coarse level is downscaled by 2**levels.
+        downscale (callable, optional): Function returning the haystack downscaled by 2**levels,
+            e.g. `Haystack.downscaled`. Defaults to resizing the haystack.
+
+    Returns:
+        matches (Tuple): The rows, columns and exact scores of the positions above confidence in
+            raster order. None when the pyramid cannot be used and a full search is needed.
+    """
+    needle_h, needle_w = needle.shape[:2]
+    hay_h, hay_w = haystack.shape[:2]
+    while levels > 0 and min(needle_h, needle_w) >> levels < PYRAMID_MIN_NEEDLE_SIZE:
+        levels -= 1
+    if levels == 0:
+        return None
+
+    scale = 1 << levels
+    small_haystack = _downscale(haystack, levels) if downscale is None else downscale(levels)
+    small_needle = _downscale(needle, levels)
+    coarse = cv2.matchTemplate(small_haystack, small_needle, cv2.TM_CCOEFF_NORMED)
+
+    candidates = (coarse > confidence - PYRAMID_COARSE_MARGIN).astype(numpy.uint8)
+    count = numpy.count_nonzero(candidates)
+    if count > PYRAMID_MAX_CANDIDATE_RATIO * candidates.size:
+        return None
+
+    rows, cols, scores = [], [], []
+    if count:
+        # Group neighbouring candidates so each area is refined only once at full resolution
+        candidates = cv2.dilate(candidates, numpy.ones((3, 3), numpy.uint8))
+        _, _, stats, _ = cv2.connectedComponentsWithStats(candidates, connectivity=8)
+        res_h, res_w = hay_h - needle_h + 1, hay_w - needle_w + 1
+        for left, top, width, height, _ in stats[1:].tolist():
+            x0, y0 = max((left - 1) * scale, 0), max((top - 1) * scale, 0)
+            x1 = min((left + width + 1) * scale, res_w)
+            y1 = min((top + height + 1) * scale, res_h)
+            if x1 <= x0 or y1 <= y0:
+                continue
+            window = haystack[y0:y1 + needle_h - 1, x0:x1 + needle_w - 1]
+            refined = cv2.matchTemplate(window, needle, cv2.TM_CCOEFF_NORMED)
+            wy, wx = numpy.nonzero(refined > confidence)
+            rows.append(wy + y0)
+            cols.append(wx + x0)
+            scores.append(refined[wy, wx])
+
+    return _merge_matches(rows, cols, scores, hay_w)
+
+
+def _match_windows(
+    haystack: numpy.ndarray, needle: numpy.ndarray, confidence: float, windows: Sequence[Tuple[int, int, int, int]]
+) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    """
+    Template matching restricted to some areas of the haystack.
+
+    Args:
+        haystack (numpy.ndarray): The image to search.
+        needle (numpy.ndarray): The template to look for.
+        confidence (float): The minimum score (exclusive) to consider a match.
+        windows (list): The (left, top, width, height) of the areas to search.
+
+    Returns:
+        matches (Tuple): The rows, columns and scores of the positions above confidence in raster order.
+    """
+    needle_h, needle_w = needle.shape[:2]
+    hay_h, hay_w = haystack.shape[:2]
+    rows, cols, scores = [], [], []
+    for left, top, width, height in windows:
+        x0, y0 = max(left, 0), max(top, 0)
+        x1, y1 = min(left + width, hay_w), min(top + height, hay_h)
+        if x1 - x0 < needle_w or y1 - y0 < needle_h:
+            continue
+        result = cv2.matchTemplate(haystack[y0:y1, x0:x1], needle, cv2.TM_CCOEFF_NORMED)
+        wy, wx = numpy.nonzero(result > confidence)
+        rows.append(wy + y0)
+        cols.append(wx + x0)
+        scores.append(result[wy, wx])
+    return _merge_matches(rows, cols, scores, hay_w)
+
+
+def _merge_matches(
+    rows: List[numpy.ndarray], cols: List[numpy.ndarray], scores: List[numpy.ndarray], width: int
+) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    if not rows:
+        empty = numpy.empty(0, dtype=numpy.intp)
+        return empty, empty, numpy.empty(0, dtype=numpy.float32)
+
+    rows, cols, scores = numpy.concatenate(rows), numpy.concatenate(cols), numpy.concatenate(scores)
+    # Windows may overlap, keep each position once and in raster order
+    _, unique = numpy.unique(rows * width + cols, return_index=True)
+    return rows[unique], cols[unique], scores[unique]
+
+
+def _top_matches(scores: numpy.ndarray, confidence: float, limit: int) -> numpy.ndarray:
+    """
+    Select the indices of the best scores above confidence.
+
+    Args:
+        scores (numpy.ndarray): The flattened matching scores.
+        confidence (float): The minimum score (exclusive) to consider a match.
+        limit (int): The maximum number of indices to return.
+
+    Returns:
+        indices (numpy.ndarray): Up to limit indices ordered by descending score. Ties are kept in
+            raster order.
+    """
+    if limit <= 0 or scores.size == 0:
+        return numpy.empty(0, dtype=numpy.intp)
+
+    if limit == 1:
+        # Single best match: a linear scan is enough
+        best = int(numpy.argmax(scores))
+        if scores[best] > confidence:
+            return numpy.array([best], dtype=numpy.intp)
+        if not numpy.isnan(scores[best]):
+            return numpy.empty(0, dtype=numpy.intp)
+
+    match_indices = numpy.flatnonzero(scores > confidence)
+    if len(match_indices) > limit:
+        # Keep only the k best candidates without sorting all of them
+        top = numpy.argpartition(-scores[match_indices], limit - 1)[:limit]
+        match_indices = numpy.sort(match_indices[top])
+    order = numpy.argsort(-scores[match_indices], kind="stable")
+    return match_indices[order]
+
+
+def non_max_suppression(
+    boxes: Sequence[Box],
+    scores: Optional[Sequence[float]] = None,
+    overlap: float = 0.0,
+    grid: Optional[bool] = None,
+) -> List[Box]:
+    """
+    Remove overlapping boxes keeping the ones with the highest scores.
+
+    Args:
+        boxes (Sequence[Box]): The candidate boxes.
+        scores (Sequence[float], optional): The score of each box. When not given the boxes are
+            assumed to be ordered by descending score, as yielded by `locate_all_opencv`.
+        overlap (float, optional): Maximum intersection over union allowed between two boxes kept.
+            Defaults to 0 which suppresses boxes with any overlap.
+        grid (bool, optional): Whether or not to bucket the boxes in a grid so each box is compared
+            only against its neighbours. Defaults to None which enables it for large inputs.
+
+    Returns:
+        boxes (List[Box]): The boxes kept in descending score order.
+    """
+    if len(boxes) == 0:
+        return []
+
+    coords = numpy.array([tuple(b) for b in boxes], dtype=numpy.float64).reshape(-1, 4)
+    if scores is None:
+        order = numpy.arange(len(boxes))
+    else:
+        order = numpy.argsort(-numpy.asarray(scores, dtype=numpy.float64), kind="stable")
+
+    if grid is None:
+        grid = len(boxes) > NMS_GRID_MIN_BOXES
+
+    if grid:
+        keep = _nms_grid(coords, order, overlap)
+    else:
+        keep = _nms_greedy(coords, order, overlap)
+    return [boxes[idx] for idx in keep]
+
+
+def _suppressed(
+    x1: numpy.ndarray, y1: numpy.ndarray, x2: numpy.ndarray, y2: numpy.ndarray,
+    box: numpy.ndarray, overlap: float
+) -> numpy.ndarray:
+    inter_w = numpy.minimum(x2, box[0] + box[2]) - numpy.maximum(x1, box[0])
+    inter_h = numpy.minimum(y2, box[1] + box[3]) - numpy.maximum(y1, box[1])
+    inter = numpy.clip(inter_w, 0, None) * numpy.clip(inter_h, 0, None)
+    if overlap <= 0:
+        return inter > 0
+    union = (x2 - x1) * (y2 - y1) + box[2] * box[3] - inter
+    return inter > overlap * union
+
+
+def _nms_greedy(coords: numpy.ndarray, order: numpy.ndarray, overlap: float) -> List[int]:
+    x1, y1 = coords[:, 0], coords[:, 1]
+    x2, y2 = x1 + coords[:, 2], y1 + coords[:, 3]
+
+    keep = []
+    while order.size:
+        idx = order[0]
+        keep.append(int(idx))
+        rest = order[1:]
+        mask = _suppressed(x1[rest], y1[rest], x2[rest], y2[rest], coords[idx], overlap)
+        order = rest[~mask]
+    return keep
+
+
+def _nms_grid(coords: numpy.ndarray, order: numpy.ndarray, overlap: float) -> List[int]:
+    # With cells as large as the largest box, two boxes can only overlap when
+    # their top-left corners fall in neighbouring cells.
+    cell_w = max(coords[:, 2].max(), 1.0)
+    cell_h = max(coords[:, 3].max(), 1.0)
+    cells_x = numpy.floor_divide(coords[:, 0], cell_w).astype(numpy.int64).tolist()
+    cells_y = numpy.floor_divide(coords[:, 1], cell_h).astype(numpy.int64).tolist()
+    rects = coords.tolist()
+
+    buckets = {}
+    keep = []
+    for idx in order.tolist():
+        cx, cy = cells_x[idx], cells_y[idx]
+        neighbours = (
+            k
+            for dx in (-1, 0, 1)
+            for dy in (-1, 0, 1)
+            for k in buckets.get((cx + dx, cy + dy), ())
+        )
+        if any(_overlaps(rects[idx], rects[k], overlap) for k in neighbours):
+            continue
+        keep.append(idx)
+        buckets.setdefault((cx, cy), []).append(idx)
+    return keep
+
+
+def _overlaps(a: List[float], b: List[float], overlap: float) -> bool:
+    inter_w = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+    inter_h = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+    if inter_w <= 0 or inter_h <= 0:
+        return False
+    inter = inter_w * inter_h
+    return overlap <= 0 or inter > overlap * (a[2] * a[3] + b[2] * b[3] - inter)
@@ -0,0 +1,252 @@
+"""
+Display geometry helpers.
+
+Reading the screen dimensions through a screenshot is expensive, so the size and the monitor
+layout are cached here and refreshed only when they may have changed.
+"""
+import collections
+import platform
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from PIL import ImageGrab
+
+from . import config
+
+try:
+    from Xlib import X
+    from Xlib import display as xdisplay
+    from Xlib.ext import randr
+except ImportError:
+    xdisplay = None
+
+Monitor = collections.namedtuple("Monitor", "index left top width height primary name")
+
+
+class DisplayGeometry:
+    """
+    Cache for the screen dimensions.
+
+    On Linux (X11) the size of the root window and the monitors are read once and refreshed
+    only when the X server reports that the root window was reconfigured or, when available,
+    a RandR screen change notification.
+    On other platforms the size is read from a screenshot and kept for `ttl` milliseconds and
+    the whole screen is reported as a single monitor.
+
+    Args:
+        ttl (int, optional): How long (ms) a size read from a screenshot is considered valid.
+            Defaults to `config.DISPLAY_SIZE_CACHE_TTL`.
+    """
+
+    def __init__(self, ttl: Optional[int] = None):
+        self._ttl = config.DISPLAY_SIZE_CACHE_TTL if ttl is None else ttl
+        self._lock = threading.RLock()
+        self._size = None
+        self._monitors = None
+        self._timestamp = 0.0
+        self._display = None
+        self._root = None
+        self._randr_event = None
+        self._x11_failed = False
+
+    def size(self) -> Tuple[int, int]:
+        """
+        The screen dimension in pixels.
+
+        Returns:
+            size (Tuple): The screen width and height in pixels.
+        """
+        with self._lock:
+            if self._connect():
+                try:
+                    self._refresh()
+                    if self._size is None:
+                        geometry = self._root.get_geometry()
+                        self._size = (geometry.width, geometry.height)
+                    return self._size
+                except Exception:
+                    # The connection to the X server is gone, fallback to screenshots.
+                    self._disconnect()
+                    self._x11_failed = True
+                    self._size = None
+
+            now = time.monotonic()
+            if self._size is None or (now - self._timestamp) * 1000 > self._ttl:
+                self._size = ImageGrab.grab().size
+                self._timestamp = now
+            return self._size
+
+    def monitors(self) -> List[Monitor]:
+        """
+        The monitors (outputs) which compose the screen.
+
+        Returns:
+            monitors (List[Monitor]): The index, position and size in pixels, whether or not it is the
+                primary monitor and the name of each monitor, sorted from left to right.
+        """
+        with self._lock:
+            if self._connect():
+                try:
+                    self._refresh()
+                    if self._monitors is None:
+                        self._monitors = self._read_monitors()
+                    if self._monitors:
+                        return self._monitors
+                except Exception:
+                    self._monitors = None
+        width, height = self.size()
+        return [Monitor(0, 0, 0, width, height, True, "default")]
+
+    def invalidate(self) -> None:
+        """
+        Discard the cached size and monitors so they are read again on the next access.
+        """
+        with self._lock:
+            self._size = None
+            self._monitors = None
+
+    def close(self) -> None:
+        """
+        Release the connection to the display server, if any.
+        """
+        with self._lock:
+            self._disconnect()
+            self._size = None
+            self._monitors = None
+
+    def _connect(self) -> bool:
+        if self._display is not None:
+            return True
+        if self._x11_failed or xdisplay is None or platform.system() != "Linux":
+            return False
+        try:
+            self._display = xdisplay.Display()
+            self._root = self._display.screen().root
+            self._root.change_attributes(event_mask=X.StructureNotifyMask)
+            if self._display.has_extension("RANDR"):
+                self._root.xrandr_select_input(randr.RRScreenChangeNotifyMask)
+                first_event = self._display.query_extension("RANDR").first_event
+                self._randr_event = first_event + randr.RRScreenChangeNotify
+            self._display.sync()
+        except Exception:
+            self._disconnect()
+            self._x11_failed = True
+            return False
+        return True
+
+    def _disconnect(self) -> None:
+        if self._display is not None:
+            try:
+                self._display.close()
+            except Exception:
+                pass
+        self._display = None
+        self._root = None
+        self._randr_event = None
+
+    def _refresh(self) -> None:
+        while self._display.pending_events():
+            event = self._display.next_event()
+            if event.type == X.ConfigureNotify or event.type == self._randr_event:
+                self._size = None
+                self._monitors = None
+
+    def _read_monitors(self) -> List[Monitor]:
+        areas = []
+        try:
+            # RandR 1.5
+            for info in self._root.xrandr_get_monitors(is_active=True).monitors:
+                name = self._display.get_atom_name(info.name)
+                width, height = info.width_in_pixels, info.height_in_pixels
+                areas.append((info.x, info.y, width, height, bool(info.primary), name))
+        except Exception:
+            areas = []
+        if not areas and self._display.has_extension("XINERAMA"):
+            screens = self._display.xinerama_query_screens().screens
+            areas = [
+                (screen.x, screen.y, screen.width, screen.height, i == 0, f"screen-{i}")
+                for i, screen in enumerate(screens)
+            ]
+        areas.sort(key=lambda area: (area[0], area[1]))
+        return [Monitor(i, *area) for i, area in enumerate(areas)]
+
+
+_geometry = None
+_geometry_lock = threading.Lock()
+
+
+def get_geometry() -> DisplayGeometry:
+    """
+    The process wide display geometry cache.
+
+    Returns:
+        geometry (DisplayGeometry): The shared DisplayGeometry instance.
+    """
+    global _geometry
+    with _geometry_lock:
+        if _geometry is None:
+            _geometry = DisplayGeometry()
+        return _geometry
+
+
+def get_monitors() -> List[Monitor]:
+    """
+    The monitors which compose the screen using the process wide cache.
+
+    Returns:
+        monitors (List[Monitor]): The monitors sorted from left to right.
+    """
+    return get_geometry().monitors()
+
+
+def get_monitor(index: int) -> Monitor:
+    """
+    A monitor by its index.
+
+    Args:
+        index (int): The monitor index, as in `get_monitors`.
+
+    Returns:
+        monitor (Monitor): The monitor.
+    """
+    monitors = get_monitors()
+    if not 0 <= index < len(monitors):
+        raise ValueError(f"Invalid monitor {index}. There are {len(monitors)} monitors available.")
+    return monitors[index]
+
+
+def monitor_region(
+    index: int, x: int = 0, y: int = 0, width: Optional[int] = None, height: Optional[int] = None
+) -> Tuple[int, int, int, int]:
+    """
+    A region relative to a monitor in screen coordinates. The region does not extend beyond the monitor.
+
+    Args:
+        index (int): The monitor index, as in `get_monitors`.
+        x (int, optional): Region start position x relative to the monitor. Defaults to 0.
+        y (int, optional): Region start position y relative to the monitor. Defaults to 0.
+        width (int, optional): Region width. Defaults to the monitor width.
+        height (int, optional): Region height. Defaults to the monitor height.
+
+    Returns:
+        region (Tuple): The left, top, width and height of the region on the screen.
+    """
+    mon = get_monitor(index)
+    if not (0 <= x < mon.width and 0 <= y < mon.height):
+        raise ValueError(
+            f"The position ({x}, {y}) is outside monitor {index}, which is {mon.width}x{mon.height} pixels."
+        )
+    width = min(width or mon.width, mon.width - x)
+    height = min(height or mon.height, mon.height - y)
+    return mon.left + x, mon.top + y, width, height
+
+
+def screen_size() -> Tuple[int, int]:
+    """
+    The screen dimension in pixels using the process wide cache.
+
+    Returns:
+        size (Tuple): The screen width and height in pixels.
+    """
+    return get_geometry().size()
@@ -0,0 +1,221 @@
+"""
+Background screen capture.
+
+A FrameGrabber keeps capturing the screen on its own thread into a ring of preallocated arrays,
+so capturing the next frame overlaps with matching the current one and every wait loop of a bot
+shares the same frames.
+"""
+import threading
+import time
+from typing import Optional, Tuple
+
+import cv2
+import numpy
+from PIL import Image
+
+from . import config
+from .capture import CaptureBackend
+
+
+class Frame:
+    """
+    A frame of the ring buffer.
+
+    While a frame is held its slot is not overwritten. Call `release` or use it as a context manager
+    when done.
+
+    Attributes:
+        image (numpy.ndarray): The pixels in BGR, or BGRA when the backend returns arrays.
+        timestamp (float): The `time.monotonic` value when the capture started.
+        sequence (int): The frame number, increasing with every capture.
+    """
+
+    def __init__(self, grabber: "FrameGrabber", slot: int, image: numpy.ndarray, timestamp: float, sequence: int):
+        self._grabber = grabber
+        self._slot = slot
+        self.image = image
+        self.timestamp = timestamp
+        self.sequence = sequence
+
+    def release(self) -> None:
+        """
+        Allow the slot of this frame to be reused.
+        """
+        if self._grabber is not None:
+            self._grabber._unpin(self._slot)
+            self._grabber = None
+
+    def __enter__(self) -> "Frame":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+
+class FrameGrabber:
+    """
+    Captures the whole screen on a background thread at a target frame rate.
+
+    Args:
+        backend (CaptureBackend): The backend used to capture the screen.
+        fps (float, optional): Target frames per second. Defaults to `config.FRAME_GRABBER_FPS`.
+        slots (int, optional): Number of frames kept in the ring buffer. Defaults to
+            `config.FRAME_GRABBER_SLOTS`.
+    """
+
+    def __init__(self, backend: CaptureBackend, fps: Optional[float] = None, slots: Optional[int] = None):
+        self.backend = backend
+        self.fps = config.FRAME_GRABBER_FPS if fps is None else fps
+        slots = config.FRAME_GRABBER_SLOTS if slots is None else slots
+        if self.fps <= 0:
+            raise ValueError("The frame rate must be positive.")
+        if slots < 2:
+            raise ValueError("The ring buffer needs at least 2 slots.")
+        self._buffers = [None] * slots
+        self._timestamps = [0.0] * slots
+        self._sequences = [0] * slots
+        self._pins = [0] * slots
+        self._latest = None
+        self._sequence = 0
+        self._error = None
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether or not the capture thread is running.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """
+        Start the capture thread.
+        """
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="FrameGrabber", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the capture thread and wait for it to finish.
+        """
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def latest(self, since: Optional[float] = None, timeout: Optional[float] = None) -> Frame:
+        """
+        The most recent frame, held until released.
+
+        Args:
+            since (float, optional): Wait for a frame whose capture started at or after this
+                `time.monotonic` value. Defaults to None, which accepts any frame.
+            timeout (float, optional): Maximum wait time (s) for the frame. Defaults to the longer of
+                1 second and two frame intervals.
+
+        Returns:
+            frame (Frame): The frame.
+
+        Raises:
+            RuntimeError: If no frame captured after since is available before the timeout or
+                before the grabber stops.
+        """
+        if timeout is None:
+            timeout = max(1.0, 2.0 / self.fps)
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while (
+                self._latest is None or (since is not None and self._timestamps[self._latest] < since)
+            ):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.running:
+                    if self._latest is None:
+                        raise RuntimeError("No frame captured.") from self._error
+                    # Never hand out a screen older than requested
+                    raise RuntimeError("No frame captured since the requested time.") from self._error
+                self._cond.wait(remaining)
+            slot = self._latest
+            self._pins[slot] += 1
+            return Frame(self, slot, self._buffers[slot], self._timestamps[slot], self._sequences[slot])
+
+    def grab(
+        self, region: Optional[Tuple[int, int, int, int]] = None, since: Optional[float] = None
+    ) -> numpy.ndarray:
+        """
+        A copy of the most recent frame, or of a region of it.
+
+        Args:
+            region (tuple, optional): Bounding box containing left, top, width and height to copy.
+                Defaults to the whole screen.
+            since (float, optional): Wait for a frame whose capture started at or after this
+                `time.monotonic` value. Defaults to None.
+
+        Returns:
+            frame (numpy.ndarray): The pixels in BGR, or BGRA when the backend returns arrays.
+        """
+        with self.latest(since) as frame:
+            image = frame.image
+            if region:
+                x, y, width, height = region
+                image = image[y:y + height, x:x + width]
+            return image.copy()
+
+    def _unpin(self, slot: int) -> None:
+        with self._cond:
+            self._pins[slot] -= 1
+
+    def _free_slot(self) -> Optional[int]:
+        for slot in range(len(self._buffers)):
+            if slot != self._latest and self._pins[slot] == 0:
+                return slot
+        return None
+
+    def _run(self) -> None:
+        interval = 1.0 / self.fps
+        while not self._stop.is_set():
+            started = time.monotonic()
+            with self._cond:
+                slot = self._free_slot()
+            if slot is None:
+                # Every slot is held by a consumer
+                self.dropped += 1
+            else:
+                try:
+                    self._capture(slot, started)
+                except Exception as e:
+                    self._error = e
+            self._stop.wait(max(interval - (time.monotonic() - started), 0))
+
+    def _capture(self, slot: int, started: float) -> None:
+        frame = self.backend.grab()
+        if isinstance(frame, Image.Image):
+            frame = numpy.asarray(frame.convert("RGB"))
+            code = cv2.COLOR_RGB2BGR
+        else:
+            code = None
+
+        buffer = self._buffers[slot]
+        if buffer is None or buffer.shape != frame.shape:
+            # First frame or the screen was resized
+            buffer = numpy.empty(frame.shape, dtype=numpy.uint8)
+            self._buffers[slot] = buffer
+        if code is None:
+            numpy.copyto(buffer, frame)
+        else:
+            cv2.cvtColor(frame, code, dst=buffer)
+
+        with self._cond:
+            self._sequence += 1
+            self._timestamps[slot] = started
+            self._sequences[slot] = self._sequence
+            self._latest = slot
+            self._error = None
+            self._cond.notify_all()
@@ -1,5 +1,6 @@
 import platform
 import time
+from typing import Callable, Optional
 
 from pynput.keyboard import Key
 from pynput.mouse import Button, Controller
@@ -69,9 +70,14 @@ def _mouse_click(
     clicks: int = 1,
     interval_between_clicks: int = 0,
     button: str = "left",
+    wait_after_move: Optional[Callable[[int], None]] = None,
+    move_delay: int = 100,
 ) -> None:
     """
     Moves the mouse and clicks at the coordinate defined by x and y.
+
+    wait_after_move is called with move_delay, the pause (ms) between moving and clicking, which
+    defaults to sleeping it.
     """
     if platform.system() == "Darwin":
         from . import os_compat
@@ -88,7 +94,10 @@ def _mouse_click(
             )
 
         mouse_controller.position = (x, y)
-        time.sleep(0.1)
+        if wait_after_move is None:
+            time.sleep(move_delay / 1000.0)
+        else:
+            wait_after_move(move_delay)
         for i in range(clicks):
             mouse_controller.click(button=mouse_button, count=1)
             time.sleep(interval_between_clicks / 1000.0)
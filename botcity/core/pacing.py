@@ -0,0 +1,86 @@
+from typing import Dict, Optional
+
+from . import config
+
+# Delays (ms) of the built-in profiles, missing categories use the `PacingProfile` defaults.
+PRESETS: Dict[str, Dict[str, int]] = {
+    "default": {},
+    "fast": {"mouse": 50, "keyboard": 30, "clipboard": 50, "scroll": 50, "post_click": 100, "pre_click": 20},
+    "slow": {"mouse": 500, "keyboard": 500, "clipboard": 500, "scroll": 500, "post_click": 1000, "pre_click": 200},
+}
+
+
+class PacingProfile:
+    """
+    The waits after each category of mouse and keyboard action of a bot.
+
+    The waits explicitly passed to an action, e.g. `click(wait_after=...)`, take precedence.
+
+    Args:
+        mouse (int, optional): Wait (ms) after moving the mouse or pressing and releasing its buttons.
+        keyboard (int, optional): Wait (ms) after typing or pressing keys.
+        clipboard (int, optional): Wait (ms) after copying or pasting.
+        scroll (int, optional): Wait (ms) after scrolling.
+        post_click (int, optional): Wait (ms) after clicking.
+        pre_click (int, optional): Pause (ms) between moving the mouse and clicking.
+            Defaults to `config.DEFAULT_SLEEP_BEFORE_CLICK`.
+
+    Every other wait defaults to `config.DEFAULT_SLEEP_AFTER_ACTION`.
+    """
+
+    CATEGORIES = ("mouse", "keyboard", "clipboard", "scroll", "post_click", "pre_click")
+
+    def __init__(
+        self,
+        mouse: Optional[int] = None,
+        keyboard: Optional[int] = None,
+        clipboard: Optional[int] = None,
+        scroll: Optional[int] = None,
+        post_click: Optional[int] = None,
+        pre_click: Optional[int] = None,
+    ):
+        default = config.DEFAULT_SLEEP_AFTER_ACTION
+        self.mouse = default if mouse is None else mouse
+        self.keyboard = default if keyboard is None else keyboard
+        self.clipboard = default if clipboard is None else clipboard
+        self.scroll = default if scroll is None else scroll
+        self.post_click = default if post_click is None else post_click
+        self.pre_click = config.DEFAULT_SLEEP_BEFORE_CLICK if pre_click is None else pre_click
+        for category in self.CATEGORIES:
+            if getattr(self, category) < 0:
+                raise ValueError(f"The {category} wait must not be negative.")
+
+    @classmethod
+    def preset(cls, name: str, **overrides) -> "PacingProfile":
+        """
+        Create a profile from one of the `PRESETS`.
+
+        Args:
+            name (str): The preset name, e.g. "default", "fast" or "slow".
+            **overrides: Waits (ms) of the categories to change.
+
+        Returns:
+            profile (PacingProfile): The profile.
+        """
+        try:
+            delays = dict(PRESETS[name])
+        except KeyError:
+            raise ValueError(f"Unknown pacing preset '{name}'. Options are: {', '.join(sorted(PRESETS))}.")
+        delays.update(overrides)
+        return cls(**delays)
+
+    def scaled(self, factor: float) -> "PacingProfile":
+        """
+        A copy of this profile with every wait multiplied by factor.
+
+        Args:
+            factor (float): The multiplier.
+
+        Returns:
+            profile (PacingProfile): The new profile.
+        """
+        return PacingProfile(**{category: int(getattr(self, category) * factor) for category in self.CATEGORIES})
+
+    def __repr__(self) -> str:
+        delays = ", ".join(f"{category}={getattr(self, category)}" for category in self.CATEGORIES)
+        return f"PacingProfile({delays})"
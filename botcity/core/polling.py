@@ -0,0 +1,73 @@
+import time
+from typing import Generator, Optional
+
+from . import config
+
+
+class PollingScheduler:
+    """
+    Paces the wait loops used when searching or waiting for something on screen.
+
+    The first attempt happens immediately. Between attempts the scheduler sleeps for an interval
+    that starts at `min_interval` and grows by `backoff` up to `max_interval`. When a `cpu_budget`
+    is set, the sleep is extended so that the CPU time spent by the attempts does not exceed that
+    fraction of one core. Only the CPU time of the thread running the loop is counted, so other
+    threads of the process, e.g. other bots or the frame grabber, do not slow it down.
+
+    Args:
+        min_interval (int, optional): Interval (ms) after the first attempt.
+            Defaults to `config.POLLING_MIN_INTERVAL`.
+        max_interval (int, optional): Maximum interval (ms) between attempts.
+            Defaults to `config.POLLING_MAX_INTERVAL`.
+        backoff (float, optional): Factor applied to the interval after each attempt.
+            Defaults to `config.POLLING_BACKOFF`.
+        cpu_budget (float, optional): Fraction of one CPU core (0 to 1) the attempts may use.
+            Defaults to `config.POLLING_CPU_BUDGET`. None means no limit.
+    """
+
+    def __init__(
+        self,
+        min_interval: Optional[int] = None,
+        max_interval: Optional[int] = None,
+        backoff: Optional[float] = None,
+        cpu_budget: Optional[float] = None,
+    ):
+        self.min_interval = config.POLLING_MIN_INTERVAL if min_interval is None else min_interval
+        self.max_interval = config.POLLING_MAX_INTERVAL if max_interval is None else max_interval
+        self.backoff = config.POLLING_BACKOFF if backoff is None else backoff
+        self.cpu_budget = config.POLLING_CPU_BUDGET if cpu_budget is None else cpu_budget
+        if self.cpu_budget is not None and not 0 < self.cpu_budget <= 1:
+            raise ValueError("The CPU budget must be a fraction between 0 and 1.")
+
+    def poll(self, timeout: int) -> Generator[int, None, None]:
+        """
+        Iterate over the attempts of a wait loop until the timeout expires.
+
+        At least one attempt is always made and the last one happens when the timeout expires.
+
+        Args:
+            timeout (int): Maximum wait time (ms).
+
+        Returns:
+            attempts (collections.Iterable[int]): A generator with the attempt number, starting at 0.
+        """
+        deadline = time.monotonic() + max(timeout, 0) / 1000.0
+        interval = self.min_interval / 1000.0
+        attempt = 0
+
+        while True:
+            wall_start = time.monotonic()
+            cpu_start = time.thread_time()
+            yield attempt
+            attempt += 1
+
+            now = time.monotonic()
+            if now >= deadline:
+                return
+
+            delay = interval
+            if self.cpu_budget is not None:
+                cpu_used = time.thread_time() - cpu_start
+                delay = max(delay, cpu_used / self.cpu_budget - (now - wall_start))
+            time.sleep(max(min(delay, deadline - now), 0))
+            interval = min(interval * self.backoff, self.max_interval / 1000.0)
@@ -0,0 +1,363 @@
+"""
+Session screen recording.
+
+Frames are stored as zlib compressed records: a keyframe with all the pixels every few frames and,
+in between, only the tiles which changed since the previous frame XORed with it. An index at the
+end of the file allows seeking to any frame.
+
+File layout::
+
+    header | record | record | ... | index | footer
+
+    header: MAGIC, tile size (uint16)
+    record: kind (uint8), timestamp (float64), width, height (uint32), channels (uint8),
+            payload size (uint32), zlib payload
+    index:  (offset (uint64), timestamp (float64), kind (uint8)) per record
+    footer: index offset (uint64), record count (uint32), INDEX_MAGIC
+
+A delta payload is the bit mask of the changed tiles followed by the XOR of those tiles.
+"""
+import bisect
+import struct
+import threading
+import time
+import zlib
+from typing import Callable, Generator, List, Optional, Tuple
+
+import numpy
+
+from . import config
+
+MAGIC = b"BCREC\x00\x01\x00"
+INDEX_MAGIC = b"BCRIDX\x00\x00"
+
+KEYFRAME = 0
+DELTA = 1
+
+_HEADER = struct.Struct("<8sH")
+_RECORD = struct.Struct("<BdIIBI")
+_INDEX_ENTRY = struct.Struct("<QdB")
+_FOOTER = struct.Struct("<QI8s")
+
+
+def _pad(frame: numpy.ndarray, tile: int) -> numpy.ndarray:
+    if frame.ndim == 2:
+        frame = frame[:, :, None]
+    height, width = frame.shape[:2]
+    rows, cols = -(-height // tile), -(-width // tile)
+    if rows * tile == height and cols * tile == width:
+        return frame.copy()
+    padded = numpy.zeros((rows * tile, cols * tile, frame.shape[2]), dtype=numpy.uint8)
+    padded[:height, :width] = frame
+    return padded
+
+
+def _tiles(frame: numpy.ndarray, tile: int) -> numpy.ndarray:
+    # (rows, cols, tile, tile, channels) view of a padded frame
+    rows, cols = frame.shape[0] // tile, frame.shape[1] // tile
+    return frame.reshape(rows, tile, cols, tile, frame.shape[2]).swapaxes(1, 2)
+
+
+class Recorder:
+    """
+    Writes frames to a recording file.
+
+    Args:
+        filepath (str): The recording file.
+        keyframe_interval (int, optional): Number of frames between keyframes.
+            Defaults to `config.RECORDER_KEYFRAME_INTERVAL`.
+        tile (int, optional): The side (px) of the tiles compared between frames.
+            Defaults to `config.RECORDER_TILE_SIZE`.
+        compression (int, optional): The zlib compression level. Defaults to `config.RECORDER_COMPRESSION`.
+        budget (int, optional): Time (ms) a frame may take to encode. Frames are dropped after one which
+            took longer until the budget is met again. Defaults to `config.RECORDER_FRAME_BUDGET`.
+            None means no limit.
+
+    Attributes:
+        frames (int): Number of frames written.
+        dropped (int): Number of frames dropped to respect the budget.
+        encode_time (float): Total time (s) spent encoding frames.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        keyframe_interval: Optional[int] = None,
+        tile: Optional[int] = None,
+        compression: Optional[int] = None,
+        budget: Optional[int] = None,
+    ):
+        if keyframe_interval is None:
+            keyframe_interval = config.RECORDER_KEYFRAME_INTERVAL
+        self.keyframe_interval = keyframe_interval
+        self.tile = config.RECORDER_TILE_SIZE if tile is None else tile
+        self.compression = config.RECORDER_COMPRESSION if compression is None else compression
+        self.budget = config.RECORDER_FRAME_BUDGET if budget is None else budget
+        self._file = open(filepath, "wb")
+        self._file.write(_HEADER.pack(MAGIC, self.tile))
+        self._index = []
+        self._previous = None
+        self._previous_shape = None
+        self._since_keyframe = 0
+        self._debt = 0.0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self.frames = 0
+        self.dropped = 0
+        self.encode_time = 0.0
+
+    @property
+    def bytes_written(self) -> int:
+        """
+        Size of the recording so far.
+        """
+        return self._file.tell()
+
+    def add(self, frame: numpy.ndarray, timestamp: Optional[float] = None) -> bool:
+        """
+        Add a frame to the recording.
+
+        Args:
+            frame (numpy.ndarray): A BGR, BGRA or grayscale uint8 array.
+            timestamp (float, optional): The frame time. Defaults to `time.time()`.
+
+        Returns:
+            added (bool): False if the frame was dropped to respect the time budget.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            if self._debt > 0:
+                self._debt -= 1
+                self.dropped += 1
+                return False
+
+            start = time.perf_counter()
+            self._encode(frame, timestamp)
+            elapsed = time.perf_counter() - start
+            self.encode_time += elapsed
+            self.frames += 1
+            if self.budget is not None and elapsed * 1000 > self.budget:
+                self._debt = elapsed * 1000 // self.budget
+            return True
+
+    def start(self, grab: Callable[[], numpy.ndarray], fps: Optional[float] = None) -> None:
+        """
+        Record frames on a background thread.
+
+        Args:
+            grab (callable): Function returning the next frame.
+            fps (float, optional): Target frames per second. Defaults to `config.RECORDER_FPS`.
+        """
+        interval = 1.0 / (config.RECORDER_FPS if fps is None else fps)
+
+        def run():
+            while not self._stop.is_set():
+                started = time.monotonic()
+                try:
+                    self.add(grab())
+                except Exception:
+                    # e.g. the screen is locked, keep recording
+                    pass
+                self._stop.wait(max(interval - (time.monotonic() - started), 0))
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=run, name="Recorder", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """
+        Stop the background recording, if any, and write the index.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            if self._file.closed:
+                return
+            index_offset = self._file.tell()
+            for entry in self._index:
+                self._file.write(_INDEX_ENTRY.pack(*entry))
+            self._file.write(_FOOTER.pack(index_offset, len(self._index), INDEX_MAGIC))
+            self._file.close()
+
+    def __enter__(self) -> "Recorder":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _encode(self, frame: numpy.ndarray, timestamp: float) -> None:
+        channels = 1 if frame.ndim == 2 else frame.shape[2]
+        height, width = frame.shape[:2]
+        padded = _pad(frame, self.tile)
+
+        keyframe = (
+            self._previous is None
+            or self._previous_shape != frame.shape
+            or self._since_keyframe >= self.keyframe_interval
+        )
+        if keyframe:
+            kind = KEYFRAME
+            payload = padded.tobytes()
+            self._since_keyframe = 0
+        else:
+            kind = DELTA
+            xor = numpy.bitwise_xor(padded, self._previous)
+            tiles = _tiles(xor, self.tile)
+            mask = tiles.any(axis=(2, 3, 4))
+            payload = numpy.packbits(mask).tobytes() + tiles[mask].tobytes()
+            self._since_keyframe += 1
+
+        payload = zlib.compress(payload, self.compression)
+        self._index.append((self._file.tell(), timestamp, kind))
+        self._file.write(_RECORD.pack(kind, timestamp, width, height, channels, len(payload)))
+        self._file.write(payload)
+        self._previous = padded
+        self._previous_shape = frame.shape
+
+
+class RecordingReader:
+    """
+    Reads the frames of a recording file.
+
+    Recordings which were not closed, and therefore have no index, are scanned on open.
+
+    Args:
+        filepath (str): The recording file.
+
+    Attributes:
+        deltas_decoded (int): Number of delta records decoded to reconstruct the frames read.
+    """
+
+    def __init__(self, filepath: str):
+        self._file = open(filepath, "rb")
+        magic, self.tile = _HEADER.unpack(self._file.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{filepath} is not a recording.")
+        self._entries = self._read_index() or self._scan()
+        self._keyframes = [position for position, (_, _, kind) in enumerate(self._entries) if kind == KEYFRAME]
+        self._cache = None
+        self.deltas_decoded = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def timestamps(self) -> List[float]:
+        """
+        The timestamp of every frame.
+        """
+        return [timestamp for _, timestamp, _ in self._entries]
+
+    def frame(self, index: int) -> numpy.ndarray:
+        """
+        Reconstruct a frame.
+
+        Args:
+            index (int): The frame number.
+
+        Returns:
+            frame (numpy.ndarray): The frame as it was recorded.
+        """
+        if index < 0:
+            index += len(self._entries)
+        if not 0 <= index < len(self._entries):
+            raise IndexError("frame index out of range")
+
+        # Decode from the nearest keyframe, or from the cached frame when it is closer
+        keyframe = self._keyframes[bisect.bisect_right(self._keyframes, index) - 1]
+        if self._cache is not None and keyframe <= self._cache[0] <= index:
+            start, padded, shape = self._cache
+            start += 1
+        else:
+            start, padded, shape = keyframe, None, None
+        for position in range(start, index + 1):
+            padded, shape = self._decode(position, padded)
+        self._cache = (index, padded, shape)
+        return padded[:shape[0], :shape[1]].reshape(shape).copy()
+
+    def frame_at(self, timestamp: float) -> numpy.ndarray:
+        """
+        The last frame recorded at or before timestamp.
+
+        Args:
+            timestamp (float): The time.
+
+        Returns:
+            frame (numpy.ndarray): The frame.
+        """
+        index = int(numpy.searchsorted(self.timestamps, timestamp, side="right")) - 1
+        return self.frame(max(index, 0))
+
+    def __iter__(self) -> Generator[Tuple[float, numpy.ndarray], None, None]:
+        for index in range(len(self._entries)):
+            yield self._entries[index][1], self.frame(index)
+
+    def close(self) -> None:
+        """
+        Close the recording file.
+        """
+        self._file.close()
+
+    def __enter__(self) -> "RecordingReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _read_index(self) -> Optional[List[Tuple[int, float, int]]]:
+        self._file.seek(0, 2)
+        size = self._file.tell()
+        if size < _HEADER.size + _FOOTER.size:
+            return None
+        self._file.seek(size - _FOOTER.size)
+        index_offset, count, magic = _FOOTER.unpack(self._file.read(_FOOTER.size))
+        if magic != INDEX_MAGIC:
+            return None
+        self._file.seek(index_offset)
+        data = self._file.read(count * _INDEX_ENTRY.size)
+        return [entry for entry in _INDEX_ENTRY.iter_unpack(data)]
+
+    def _scan(self) -> List[Tuple[int, float, int]]:
+        entries = []
+        offset = _HEADER.size
+        self._file.seek(offset)
+        while True:
+            header = self._file.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                break
+            kind, timestamp, _, _, _, length = _RECORD.unpack(header)
+            if len(self._file.read(length)) < length:
+                # Truncated record
+                break
+            entries.append((offset, timestamp, kind))
+            offset += _RECORD.size + length
+        return entries
+
+    def _decode(
+        self, position: int, previous: Optional[numpy.ndarray]
+    ) -> Tuple[numpy.ndarray, Tuple[int, ...]]:
+        offset = self._entries[position][0]
+        self._file.seek(offset)
+        kind, _, width, height, channels, length = _RECORD.unpack(self._file.read(_RECORD.size))
+        payload = zlib.decompress(self._file.read(length))
+        tile = self.tile
+        rows, cols = -(-height // tile), -(-width // tile)
+        padded_shape = (rows * tile, cols * tile, channels)
+        shape = (height, width) if channels == 1 else (height, width, channels)
+
+        if kind == KEYFRAME:
+            return numpy.frombuffer(payload, dtype=numpy.uint8).reshape(padded_shape).copy(), shape
+
+        self.deltas_decoded += 1
+
+        mask_size = -(-(rows * cols) // 8)
+        mask = numpy.unpackbits(numpy.frombuffer(payload[:mask_size], dtype=numpy.uint8))
+        mask = mask[:rows * cols].reshape(rows, cols).astype(bool)
+        xor = numpy.frombuffer(payload[mask_size:], dtype=numpy.uint8).reshape(-1, tile, tile, channels)
+        frame = previous.copy()
+        tiles = _tiles(frame, tile)
+        tiles[mask] ^= xor
+        return frame, shape
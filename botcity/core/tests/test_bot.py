@@ -0,0 +1,230 @@
+import os
+import time
+
+import cv2
+import numpy
+import pytest
+
+from botcity.core import DesktopBot, capture, config, display
+from botcity.core.polling import PollingScheduler
+from botcity.core.recorder import RecordingReader
+
+WIDTH, HEIGHT = 160, 120
+
+
+def _screen(value: int = 0, size=(HEIGHT, WIDTH)) -> numpy.ndarray:
+    return numpy.full(size + (4,), value, dtype=numpy.uint8)
+
+
+def _label(seed: int) -> numpy.ndarray:
+    return numpy.random.default_rng(seed).integers(0, 255, (16, 20, 3), dtype=numpy.uint8)
+
+
+LABELS = {"ok": _label(1), "cancel": _label(2)}
+
+
+def _frame(seed: int = 0, **positions) -> numpy.ndarray:
+    """
+    A noisy BGR screen with the labels pasted at the given (left, top) positions.
+    """
+    frame = numpy.random.default_rng(100 + seed).integers(0, 255, (HEIGHT, WIDTH, 3), dtype=numpy.uint8)
+    for name, (left, top) in positions.items():
+        label = LABELS[name]
+        frame[top:top + label.shape[0], left:left + label.shape[1]] = label
+    return frame
+
+
+@pytest.fixture
+def bot(tmp_path):
+    bot = DesktopBot()
+    for name, label in LABELS.items():
+        path = os.path.join(tmp_path, f"{name}.png")
+        cv2.imwrite(path, label)
+        bot.add_image(name, path)
+    bot.polling = PollingScheduler(min_interval=10, max_interval=10)
+    yield bot
+    bot.capture_backend = None
+
+
+def _replay(bot, *frames):
+    bot.capture_backend = capture.ReplayBackend(list(frames), loop=False)
+
+
+def test_find_multiple_on_a_static_screen(bot):
+    _replay(bot, _frame(ok=(10, 20), cancel=(100, 80)))
+    results = bot.find_multiple(["ok", "cancel"], waiting_time=1000)
+    assert (results["ok"].left, results["ok"].top) == (10, 20)
+    assert (results["cancel"].left, results["cancel"].top) == (100, 80)
+
+    _replay(bot, _frame(ok=(10, 20)))
+    bot.search_stats.reset()
+    results = bot.find_multiple(["ok", "cancel"], waiting_time=200)
+    assert results["cancel"] is None
+    # The following polls captured the same screen and skipped matching
+    assert bot.search_stats.skipped == bot.search_stats.frames - 1 > 0
+
+
+def test_find_multiple_incremental_waits_for_elements_appearing(bot):
+    _replay(
+        bot, _frame(), _frame(1, ok=(10, 20)), _frame(2, ok=(10, 20)), _frame(3, ok=(10, 20), cancel=(100, 80))
+    )
+    results = bot.find_multiple(["ok", "cancel"], waiting_time=2000, incremental=True)
+    assert (results["ok"].left, results["ok"].top) == (10, 20)
+    assert (results["cancel"].left, results["cancel"].top) == (100, 80)
+
+
+def test_find_multiple_incremental_searches_moved_elements_again(bot):
+    _replay(bot, _frame(ok=(10, 20)), _frame(1, ok=(60, 50)), _frame(2, ok=(60, 50), cancel=(100, 80)))
+    results = bot.find_multiple(["ok", "cancel"], waiting_time=2000, incremental=True)
+    assert (results["ok"].left, results["ok"].top) == (60, 50)
+    assert (results["cancel"].left, results["cancel"].top) == (100, 80)
+
+
+def test_find_multiple_iter_yields_elements_as_they_appear(bot):
+    _replay(bot, _frame(), _frame(1, cancel=(100, 80)), _frame(2, ok=(10, 20), cancel=(100, 80)))
+    found = bot.find_multiple_iter(["ok", "cancel"], waiting_time=2000)
+    assert [(label, ele.left, ele.top) for label, ele in found] == [("cancel", 100, 80), ("ok", 10, 20)]
+
+    _replay(bot, _frame())
+    assert list(bot.find_multiple_iter(["ok"], waiting_time=100)) == []
+
+
+def test_location_hint_miss_is_one_poll(bot):
+    bot.use_location_hints = True
+    _replay(bot, _frame(ok=(10, 20)))
+    assert bot.find_until("ok", waiting_time=1000) is not None
+
+    _replay(bot, _frame(1, ok=(130, 100)))
+    bot.search_stats.reset()
+    ele = bot.find_until("ok", waiting_time=1000)
+    assert (ele.left, ele.top) == (130, 100)
+    assert bot.location_hints.misses == 1
+    assert bot.search_stats.frames == 1
+
+
+def test_wait_for_any_returns_the_first_element_to_appear(bot):
+    _replay(bot, _frame(), _frame(1), _frame(2, cancel=(100, 80)), _frame(3, ok=(10, 20), cancel=(100, 80)))
+    label, ele = bot.wait_for_any(["ok", "cancel"], waiting_time=2000)
+    assert label == "cancel"
+    assert (ele.left, ele.top) == (100, 80)
+    assert bot.get_last_element() == ele
+
+
+def test_wait_for_any_times_out_on_a_static_screen(bot):
+    _replay(bot, _frame())
+    bot.search_stats.reset()
+    assert bot.wait_for_any(["ok", "cancel"], waiting_time=200) == (None, None)
+    assert bot.get_last_element() is None
+    assert bot.search_stats.skipped == bot.search_stats.frames - 1 > 0
+
+
+def test_wait_until_vanish(bot):
+    _replay(bot, _frame(ok=(10, 20)), _frame(1, ok=(10, 20)), _frame(2))
+    assert bot.wait_until_vanish("ok", waiting_time=2000)
+
+    _replay(bot, _frame(ok=(10, 20)))
+    assert not bot.wait_until_vanish("ok", waiting_time=200)
+
+
+def test_wait_until_stable(bot):
+    _replay(bot, *[_frame(seed) for seed in range(5)])
+    started = time.monotonic()
+    assert bot.wait_until_stable(stable_time=100, waiting_time=2000)
+    # The screen changed during the first 4 polls
+    assert time.monotonic() - started >= 0.1 + 4 * 0.01
+
+    _replay(bot, *[_frame(seed) for seed in range(100)])
+    assert not bot.wait_until_stable(stable_time=100, waiting_time=200)
+
+
+def test_settle_mode_returns_early_on_a_still_screen(bot):
+    bot.settle_after_action = True
+    _replay(bot, _frame())
+    started = time.monotonic()
+    bot._wait_after_action(1000)
+    # Not before the application had time to start repainting
+    assert config.SETTLE_MIN_WAIT / 1000 <= time.monotonic() - started < 0.5
+
+    # A screen which keeps changing waits for the whole interval
+    _replay(bot, *[_frame(seed) for seed in range(100)])
+    started = time.monotonic()
+    bot._wait_after_action(300)
+    assert time.monotonic() - started >= 0.3
+
+    bot.settle_after_action = False
+    started = time.monotonic()
+    bot._wait_after_action(100)
+    assert time.monotonic() - started >= 0.1
+
+
+class _FailingBackend(capture.ReplayBackend):
+    def __init__(self, frames, grabs):
+        super().__init__(frames)
+        self.grabs = grabs
+
+    def grab(self, region=None):
+        self.grabs -= 1
+        if self.grabs < 0:
+            raise OSError("screen locked")
+        return super().grab(region)
+
+
+def test_settle_mode_falls_back_to_the_time_left(bot):
+    bot.settle_after_action = True
+    bot.capture_backend = _FailingBackend([_frame(seed) for seed in range(100)], grabs=20)
+    started = time.monotonic()
+    bot._wait_after_action(400)
+    assert 0.4 <= time.monotonic() - started < 0.55
+
+
+def test_search_region_relative_to_a_monitor(bot, monkeypatch):
+    monitors = [
+        display.Monitor(0, 0, 0, 800, 600, True, "left"),
+        display.Monitor(1, 800, 0, 640, 480, False, "right"),
+    ]
+    monkeypatch.setattr(display.DisplayGeometry, "monitors", lambda self: monitors)
+
+    assert bot._search_region(None, None, None, None, monitor=1) == (800, 0, 640, 480)
+    assert bot._search_region(600, 400, 100, 100, monitor=1) == (1400, 400, 40, 80)
+    with pytest.raises(ValueError):
+        bot._search_region(700, 0, None, None, monitor=1)
+
+
+class _LiveBackend(capture.CaptureBackend):
+    name = "live"
+    supports_region = True
+    auto = False
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def grab(self, region=None):
+        return capture.ReplayBackend([self.frame]).grab(region)
+
+
+def test_get_element_coords_waits_for_a_frame_of_the_grabber_after_the_call(bot):
+    backend = _LiveBackend(_frame(ok=(10, 20)))
+    grabber = bot.start_frame_grabber(fps=2, backend=backend)
+    try:
+        grabber.latest().release()
+        backend.frame = _frame(1, ok=(60, 50))
+        assert bot.get_element_coords("ok") == (60, 50)
+    finally:
+        bot.stop_frame_grabber()
+
+
+def test_recording_continues_after_the_frame_grabber_stops(bot, tmp_path):
+    bot.capture_backend = capture.ReplayBackend([_screen(1)])
+    bot.start_frame_grabber(fps=100, backend=capture.ReplayBackend([_screen(2)]))
+    path = os.path.join(tmp_path, "session.rec")
+    bot.start_recording(path, fps=50)
+    try:
+        time.sleep(0.1)
+        bot.stop_frame_grabber()
+        time.sleep(0.1)
+    finally:
+        bot.stop_recording()
+
+    with RecordingReader(path) as reader:
+        assert reader.frame(0)[0, 0, 0] == 2
+        assert reader.frame(-1)[0, 0, 0] == 1
@@ -0,0 +1,56 @@
+import numpy
+import pytest
+from PIL import Image
+
+from botcity.core import capture
+
+
+def test_registry_and_auto_selection():
+    assert capture.get_backend_class("pil") is capture.PILBackend
+    assert capture.get_backend_class("replay") is capture.ReplayBackend
+    with pytest.raises(ValueError):
+        capture.get_backend_class("missing")
+
+    names = capture.available_backends()
+    assert "pil" in names
+    assert "replay" not in names
+    assert "xshm" not in names
+    costs = [capture.get_backend_class(name).cost for name in names]
+    assert costs == sorted(costs)
+
+
+def test_replay_backend_crops_and_loops():
+    frames = [numpy.full((20, 30, 4), value, dtype=numpy.uint8) for value in (1, 2)]
+    frames.append(Image.new("RGB", (30, 20), (3, 3, 3)))
+    backend = capture.create_backend("replay", source=frames)
+
+    assert backend.grab().shape == (20, 30, 4)
+    assert backend.grab((5, 2, 10, 8)).shape == (8, 10, 4)
+    assert backend.grab((5, 2, 10, 8)).size == (10, 8)
+    assert backend.grab()[0, 0, 0] == 1
+
+
+def test_to_image_converts_bgra():
+    frame = numpy.zeros((2, 3, 4), dtype=numpy.uint8)
+    frame[:, :, 0] = 255
+    image = capture.to_image(frame)
+    assert image.mode == "RGB"
+    assert image.getpixel((0, 0)) == (0, 0, 255)
+
+
+def test_to_array_converts_and_crops_once():
+    image = Image.new("RGB", (30, 20), (10, 20, 30))
+    bgr = capture.to_array(image, region=(5, 2, 10, 8))
+    assert bgr.shape == (8, 10, 3)
+    assert bgr[0, 0].tolist() == [30, 20, 10]
+
+    bgra = numpy.zeros((20, 30, 4), dtype=numpy.uint8)
+    out = numpy.empty((20, 30), dtype=numpy.uint8)
+    assert capture.to_array(bgra, grayscale=True, out=out) is out
+
+    bgr_frame = numpy.zeros((20, 30, 3), dtype=numpy.uint8)
+    copy = capture.to_array(bgr_frame)
+    assert not numpy.shares_memory(copy, bgr_frame)
+
+    with pytest.raises(ValueError):
+        capture.to_array(bgra, out=out)
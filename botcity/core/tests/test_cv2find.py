@@ -0,0 +1,222 @@
+import os
+
+import numpy
+from PIL import Image
+
+from botcity.core import cv2find
+
+
+def _save_image(path, value=0, size=(8, 6)):
+    array = numpy.full((size[1], size[0], 3), value, dtype=numpy.uint8)
+    Image.fromarray(array).save(path)
+    return str(path)
+
+
+def test_template_cache_hits_and_misses(tmp_path):
+    path = _save_image(tmp_path / "needle.png", value=10)
+    cache = cv2find.TemplateCache()
+
+    first = cache.get(path)
+    second = cache.get(path)
+    gray = cache.get(path, grayscale=True)
+
+    assert first is second
+    assert first.shape == (6, 8, 3)
+    assert gray.shape == (6, 8)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_template_cache_reloads_modified_file(tmp_path):
+    path = _save_image(tmp_path / "needle.png", value=10)
+    cache = cv2find.TemplateCache()
+    assert cache.get(path)[0, 0, 0] == 10
+
+    _save_image(path, value=200)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert cache.get(path)[0, 0, 0] == 200
+    assert cache.misses == 2
+
+
+def test_template_cache_evicts_least_recently_used(tmp_path):
+    paths = [_save_image(tmp_path / f"needle{i}.png", value=i) for i in range(3)]
+    cache = cv2find.TemplateCache(maxsize=2)
+
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])
+    cache.get(paths[2])
+
+    assert len(cache) == 2
+    cache.get(paths[0])
+    assert cache.hits == 2
+    cache.get(paths[1])
+    assert cache.misses == 4
+
+
+def test_haystack_is_converted_once():
+    rng = numpy.random.default_rng(0)
+    image = Image.fromarray(rng.integers(0, 255, (60, 80, 3), dtype=numpy.uint8))
+    haystack = cv2find.Haystack(image)
+
+    assert haystack.size == (80, 60)
+    assert cv2find._load_cv2(haystack) is haystack.bgr
+    assert cv2find._load_cv2(haystack, grayscale=True) is haystack.gray
+
+    needle = haystack.bgr[10:20, 30:45].copy()
+    box = next(cv2find.locate_all_opencv(needle, haystack))
+    assert (box.left, box.top, box.width, box.height) == (30, 10, 15, 10)
+
+
+def test_locate_all_limit_keeps_best_matches():
+    rng = numpy.random.default_rng(1)
+    needle = rng.integers(0, 255, (8, 8), dtype=numpy.uint8)
+    haystack = numpy.zeros((60, 200), dtype=numpy.uint8)
+    # Noisy copies in raster order before the exact copy
+    for x in range(10, 150, 20):
+        noise = rng.integers(-40, 40, needle.shape)
+        haystack[10:18, x:x + 8] = numpy.clip(needle + noise, 0, 255)
+    haystack[40:48, 170:178] = needle
+
+    best = list(cv2find.locate_all_opencv(needle, haystack, confidence=0.5, limit=1))
+    assert [(b.left, b.top) for b in best] == [(170, 40)]
+
+    top = list(cv2find.locate_all_opencv(needle, haystack, confidence=0.5, limit=3))
+    assert (top[0].left, top[0].top) == (170, 40)
+    assert len(top) == 3
+
+
+def test_top_matches_orders_by_score():
+    scores = numpy.array([0.1, 0.95, 0.5, 0.99, 0.95, 0.7], dtype=numpy.float32)
+
+    assert cv2find._top_matches(scores, 0.6, 10).tolist() == [3, 1, 4, 5]
+    assert cv2find._top_matches(scores, 0.6, 2).tolist() == [3, 1]
+    assert cv2find._top_matches(scores, 0.6, 1).tolist() == [3]
+    assert cv2find._top_matches(scores, 0.999, 1).tolist() == []
+
+
+def test_non_max_suppression_keeps_best_of_each_cluster():
+    boxes = [
+        cv2find.Box(10, 10, 20, 20),
+        cv2find.Box(100, 10, 20, 20),
+        cv2find.Box(11, 12, 20, 20),
+        cv2find.Box(8, 9, 20, 20),
+        cv2find.Box(31, 10, 20, 20),
+    ]
+    assert cv2find.non_max_suppression(boxes) == [boxes[0], boxes[1], boxes[4]]
+
+    scores = [0.5, 0.9, 0.99, 0.1, 0.3]
+    assert cv2find.non_max_suppression(boxes, scores) == [boxes[2], boxes[1], boxes[4]]
+
+    # Loose IoU threshold keeps boxes that only overlap slightly
+    assert len(cv2find.non_max_suppression(boxes, overlap=0.9)) == 5
+
+
+def test_non_max_suppression_grid_matches_greedy():
+    rng = numpy.random.default_rng(2)
+    boxes = [cv2find.Box(int(x), int(y), 12, 9) for x, y in rng.integers(0, 300, (3000, 2))]
+    scores = rng.random(len(boxes))
+
+    for overlap in (0.0, 0.3):
+        greedy = cv2find.non_max_suppression(boxes, scores, overlap=overlap, grid=False)
+        grid = cv2find.non_max_suppression(boxes, scores, overlap=overlap, grid=True)
+        assert greedy == grid
+
+
+def test_pyramid_search_matches_full_resolution():
+    rng = numpy.random.default_rng(3)
+    coarse = rng.integers(0, 255, (40, 60), dtype=numpy.uint8)
+    haystack = numpy.kron(coarse, numpy.ones((8, 8), dtype=numpy.uint8))
+    needle = haystack[100:148, 200:264].copy()
+
+    full = list(cv2find.locate_all_opencv(needle, haystack, confidence=0.9, limit=5))
+    pyramid = list(cv2find.locate_all_opencv(needle, haystack, confidence=0.9, limit=5, pyramid=2))
+
+    assert pyramid == full
+    assert (pyramid[0].left, pyramid[0].top) == (200, 100)
+
+
+def test_pyramid_levels_are_shared_by_the_needles():
+    rng = numpy.random.default_rng(3)
+    coarse = rng.integers(0, 255, (40, 60, 3), dtype=numpy.uint8)
+    haystack = cv2find.Haystack(numpy.kron(coarse, numpy.ones((8, 8, 1), dtype=numpy.uint8)))
+    needles = [haystack.bgr[100:148, 200:264].copy(), haystack.bgr[40:88, 16:80].copy()]
+
+    for needle in needles:
+        pyramid = list(cv2find.locate_all_opencv(needle, haystack, confidence=0.9, limit=5, pyramid=2))
+        full = list(cv2find.locate_all_opencv(needle, haystack.bgr, confidence=0.9, limit=5))
+        assert pyramid == full
+    assert haystack.downscaled(2) is haystack.downscaled(2)
+    assert haystack.downscaled(2).shape == (80, 120, 3)
+    assert haystack.downscaled(2, grayscale=True).shape == (80, 120)
+
+
+def test_pyramid_search_falls_back_for_small_needles():
+    rng = numpy.random.default_rng(4)
+    haystack = rng.integers(0, 255, (50, 50), dtype=numpy.uint8)
+    needle = haystack[5:15, 20:30].copy()
+
+    assert cv2find._match_pyramid(haystack, needle, 0.9, 2) is None
+    box = next(cv2find.locate_all_opencv(needle, haystack, confidence=0.9, pyramid=2))
+    assert (box.left, box.top) == (20, 5)
+
+
+def test_location_hints_window_is_padded_and_clipped():
+    hints = cv2find.LocationHints(padding=10)
+    region = (0, 0, 100, 100)
+    assert hints.window("label", region, (20, 20)) is None
+
+    hints.update("label", cv2find.Box(5, 50, 20, 20))
+    assert hints.window("label", region, (20, 20)) == (0, 40, 35, 40)
+    assert hints.window("label", region, (50, 20)) is None
+
+    hints.record(True)
+    hints.record(False)
+    hints.record(True)
+    assert hints.hit_rate == 2 / 3
+
+
+def test_change_tracker_detects_identical_frames():
+    frame = numpy.zeros((20, 30, 3), dtype=numpy.uint8)
+    tracker = cv2find.ChangeTracker()
+
+    assert tracker.changed(frame)
+    assert not tracker.changed(frame.copy())
+    assert tracker.changed(frame, key="window")
+
+    frame[5, 5] = 1
+    assert tracker.changed(frame)
+    assert tracker.changed(Image.fromarray(frame))
+    assert not tracker.changed(Image.fromarray(frame))
+
+
+def test_dirty_regions_search_matches_full_search():
+    rng = numpy.random.default_rng(5)
+    previous = rng.integers(0, 255, (200, 300, 3), dtype=numpy.uint8)
+    needle = rng.integers(0, 255, (20, 30, 3), dtype=numpy.uint8)
+    current = previous.copy()
+    current[150:170, 40:70] = needle
+
+    assert cv2find.dirty_regions(previous, previous) == []
+    windows = cv2find.dirty_regions(previous, current, padding=(29, 19), tile=16)
+    assert windows == [(3, 125, 106, 70)]
+
+    full = list(cv2find.locate_all_opencv(needle, current, confidence=0.9))
+    partial = list(cv2find.locate_all_opencv(needle, current, confidence=0.9, windows=windows))
+    assert partial == full == [cv2find.Box(40, 150, 30, 20)]
+
+    tracker = cv2find.ChangeTracker(keep_frames=True)
+    assert tracker.search_windows(previous) is None
+    assert tracker.search_windows(previous.copy()) == []
+    assert tracker.search_windows(current, padding=(29, 19))
+
+
+def test_bgra_frames_are_searched_as_bgr():
+    rng = numpy.random.default_rng(6)
+    haystack = rng.integers(0, 255, (60, 80, 4), dtype=numpy.uint8)
+    needle = haystack[10:30, 40:70, :3].copy()
+
+    box = next(cv2find.locate_all_opencv(needle, haystack, confidence=0.9))
+    assert (box.left, box.top) == (40, 10)
+    assert cv2find.Haystack(haystack).gray.shape == (60, 80)
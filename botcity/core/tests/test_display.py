@@ -0,0 +1,43 @@
+import os
+import platform
+
+import pytest
+
+from botcity.core import display
+
+requires_x = pytest.mark.skipif(
+    platform.system() != "Linux" or not os.environ.get("DISPLAY"), reason="requires an X server"
+)
+
+
+@requires_x
+def test_monitors_cover_the_screen():
+    geometry = display.DisplayGeometry()
+    try:
+        width, height = geometry.size()
+        monitors = geometry.monitors()
+        assert monitors
+        assert [mon.index for mon in monitors] == list(range(len(monitors)))
+        for mon in monitors:
+            assert 0 <= mon.left and mon.left + mon.width <= width
+            assert 0 <= mon.top and mon.top + mon.height <= height
+    finally:
+        geometry.close()
+
+
+def test_monitor_region_is_relative_and_clipped(monkeypatch):
+    monitors = [
+        display.Monitor(0, 0, 0, 1920, 1080, True, "left"),
+        display.Monitor(1, 1920, 0, 1280, 1024, False, "right"),
+    ]
+    monkeypatch.setattr(display.DisplayGeometry, "monitors", lambda self: monitors)
+
+    assert display.monitor_region(1) == (1920, 0, 1280, 1024)
+    assert display.monitor_region(1, 100, 50, 300, 200) == (2020, 50, 300, 200)
+    assert display.monitor_region(1, 1200, 1000, 300, 200) == (3120, 1000, 80, 24)
+    with pytest.raises(ValueError):
+        display.monitor_region(1, 1280, 0)
+    with pytest.raises(ValueError):
+        display.monitor_region(0, 10, 2000)
+    with pytest.raises(ValueError):
+        display.monitor_region(2)
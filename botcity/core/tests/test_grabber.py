@@ -0,0 +1,73 @@
+import time
+
+import numpy
+import pytest
+from PIL import Image
+
+from botcity.core import capture
+from botcity.core.grabber import FrameGrabber
+
+
+def test_frame_grabber_serves_recent_frames():
+    frames = [numpy.full((20, 30, 4), value, dtype=numpy.uint8) for value in range(10)]
+    grabber = FrameGrabber(capture.ReplayBackend(frames), fps=200, slots=3)
+    grabber.start()
+    try:
+        started = time.monotonic()
+        with grabber.latest(since=started) as frame:
+            assert frame.timestamp >= started
+            assert frame.image.shape == (20, 30, 4)
+            held = frame.image[0, 0, 0]
+            sequence = frame.sequence
+            time.sleep(0.05)
+            # The held slot is not overwritten while newer frames are captured
+            assert frame.image[0, 0, 0] == held
+            assert grabber.latest().sequence > sequence
+
+        crop = grabber.grab((5, 2, 10, 8))
+        assert crop.shape == (8, 10, 4)
+    finally:
+        grabber.stop()
+    assert not grabber.running
+
+
+def test_frame_grabber_converts_pil_frames_to_bgr():
+    image = Image.new("RGB", (4, 3), (10, 20, 30))
+    grabber = FrameGrabber(capture.ReplayBackend([image]), fps=100)
+    grabber.start()
+    try:
+        frame = grabber.grab()
+    finally:
+        grabber.stop()
+    assert frame.shape == (3, 4, 3)
+    assert frame[0, 0].tolist() == [30, 20, 10]
+
+
+class _FailingBackend(capture.ReplayBackend):
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.failing = False
+
+    def grab(self, region=None):
+        if self.failing:
+            raise OSError("capture failed")
+        return super().grab(region)
+
+
+def test_frame_grabber_never_returns_stale_frames():
+    backend = _FailingBackend([numpy.zeros((20, 30, 4), dtype=numpy.uint8)])
+    grabber = FrameGrabber(backend, fps=100)
+    grabber.start()
+    try:
+        grabber.latest().release()
+        backend.failing = True
+        time.sleep(0.05)
+        with pytest.raises(RuntimeError):
+            grabber.latest(since=time.monotonic(), timeout=0.1)
+        # Frames captured before since are still available without it
+        grabber.latest().release()
+    finally:
+        grabber.stop()
+
+    with pytest.raises(RuntimeError):
+        grabber.latest(since=time.monotonic())
@@ -0,0 +1,21 @@
+import pytest
+
+from botcity.core import config
+from botcity.core.pacing import PacingProfile
+
+
+def test_pacing_profile_presets():
+    default = PacingProfile()
+    assert default.mouse == default.post_click == config.DEFAULT_SLEEP_AFTER_ACTION
+    assert default.pre_click == config.DEFAULT_SLEEP_BEFORE_CLICK
+
+    fast = PacingProfile.preset("fast", post_click=10)
+    assert fast.keyboard < config.DEFAULT_SLEEP_AFTER_ACTION
+    assert fast.post_click == 10
+    assert fast.pre_click < config.DEFAULT_SLEEP_BEFORE_CLICK
+    assert fast.scaled(2).keyboard == fast.keyboard * 2
+
+    with pytest.raises(ValueError):
+        PacingProfile.preset("unknown")
+    with pytest.raises(ValueError):
+        PacingProfile(scroll=-1)
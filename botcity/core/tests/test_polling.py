@@ -0,0 +1,64 @@
+import threading
+import time
+
+import pytest
+
+from botcity.core.polling import PollingScheduler
+
+
+def test_poll_makes_at_least_one_attempt():
+    assert list(PollingScheduler().poll(0)) == [0]
+
+
+def test_poll_backs_off_until_timeout():
+    scheduler = PollingScheduler(min_interval=10, max_interval=40, backoff=2)
+    stamps = []
+    start = time.monotonic()
+    for _ in scheduler.poll(200):
+        stamps.append(time.monotonic())
+    elapsed = time.monotonic() - start
+
+    gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+    assert 0.2 <= elapsed < 0.4
+    assert gaps[0] < gaps[2]
+    assert 4 <= len(stamps) <= 10
+
+
+def test_poll_respects_cpu_budget():
+    scheduler = PollingScheduler(min_interval=0, max_interval=0, cpu_budget=0.5)
+    start = time.monotonic()
+    cpu_start = time.thread_time()
+    for _ in scheduler.poll(300):
+        busy_until = time.thread_time() + 0.02
+        while time.thread_time() < busy_until:
+            pass
+    wall = time.monotonic() - start
+    cpu = time.thread_time() - cpu_start
+    assert cpu / wall < 0.75
+
+
+def test_cpu_budget_ignores_other_threads():
+    stop = threading.Event()
+
+    def spin():
+        while not stop.is_set():
+            pass
+
+    thread = threading.Thread(target=spin, daemon=True)
+    thread.start()
+    try:
+        scheduler = PollingScheduler(min_interval=10, max_interval=10, cpu_budget=0.1)
+        attempts = 0
+        for _ in scheduler.poll(300):
+            # e.g. waiting for a capture, which uses no CPU time of this thread
+            time.sleep(0.02)
+            attempts += 1
+    finally:
+        stop.set()
+        thread.join()
+    assert attempts >= 6
+
+
+def test_invalid_cpu_budget():
+    with pytest.raises(ValueError):
+        PollingScheduler(cpu_budget=2)
@@ -0,0 +1,71 @@
+import os
+
+import numpy
+
+from botcity.core.recorder import Recorder, RecordingReader
+
+
+def _frames():
+    rng = numpy.random.default_rng(7)
+    frame = rng.integers(0, 255, (70, 100, 3), dtype=numpy.uint8)
+    frames = [frame]
+    for i in range(8):
+        frame = frame.copy()
+        frame[i * 5:i * 5 + 10, 90:100] = i
+        frames.append(frame)
+    frames.append(rng.integers(0, 255, (50, 60, 3), dtype=numpy.uint8))
+    frames.append(numpy.zeros((50, 60), dtype=numpy.uint8))
+    return frames
+
+
+def test_recording_round_trip(tmp_path):
+    path = os.path.join(tmp_path, "session.rec")
+    frames = _frames()
+    with Recorder(path, keyframe_interval=4, tile=16, budget=None) as recorder:
+        for i, frame in enumerate(frames):
+            assert recorder.add(frame, timestamp=float(i))
+
+    with RecordingReader(path) as reader:
+        assert len(reader) == len(frames)
+        assert reader.timestamps == [float(i) for i in range(len(frames))]
+        for index in (6, 2, 9, 0, -1):
+            assert numpy.array_equal(reader.frame(index), frames[index])
+        assert numpy.array_equal(reader.frame_at(3.5), frames[3])
+        for (timestamp, frame), expected in zip(reader, frames):
+            assert numpy.array_equal(frame, expected)
+
+
+def test_unfinished_recording_is_scanned(tmp_path):
+    path = os.path.join(tmp_path, "session.rec")
+    frames = _frames()[:5]
+    recorder = Recorder(path, tile=16, budget=None)
+    for frame in frames:
+        recorder.add(frame)
+    recorder._file.flush()
+
+    with RecordingReader(path) as reader:
+        assert len(reader) == len(frames)
+        assert numpy.array_equal(reader.frame(4), frames[4])
+    recorder.close()
+
+
+def test_seeking_decodes_from_the_nearest_keyframe(tmp_path):
+    path = os.path.join(tmp_path, "session.rec")
+    frame = numpy.zeros((40, 40, 3), dtype=numpy.uint8)
+    frames = []
+    with Recorder(path, keyframe_interval=4, tile=8, budget=None) as recorder:
+        for i in range(20):
+            frame = frame.copy()
+            frame[i * 2:i * 2 + 4, (i * 7) % 36:(i * 7) % 36 + 4] = i + 1
+            frames.append(frame)
+            recorder.add(frame, timestamp=float(i))
+
+    # Keyframes at 0, 5, 10 and 15
+    with RecordingReader(path) as reader:
+        for index, deltas in ((1, 1), (18, 3), (19, 1), (12, 2), (10, 0), (4, 4)):
+            before = reader.deltas_decoded
+            assert numpy.array_equal(reader.frame(index), frames[index])
+            assert reader.deltas_decoded - before == deltas
+        before = reader.deltas_decoded
+        assert numpy.array_equal(reader.frame_at(17.5), frames[17])
+        assert reader.deltas_decoded - before == 2
@@ -0,0 +1,21 @@
+import os
+
+from PIL import Image
+
+from botcity.core.writer import ScreenshotWriter
+
+
+def test_screenshot_writer_saves_in_background(tmp_path):
+    writer = ScreenshotWriter(workers=2, queue_size=1, compression=1)
+    paths = [os.path.join(tmp_path, f"shot{i}.png") for i in range(5)]
+    for i, path in enumerate(paths):
+        writer.submit(Image.new("RGB", (64, 48), (i, i, i)), path)
+    writer.submit(Image.new("RGB", (4, 4)), os.path.join(tmp_path, "missing", "shot.png"))
+    writer.close()
+
+    assert writer.submitted == 6
+    assert writer.written == 5
+    assert writer.failed == 1
+    assert writer.pending == 0
+    for i, path in enumerate(paths):
+        assert Image.open(path).getpixel((0, 0)) == (i, i, i)
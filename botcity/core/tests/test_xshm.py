@@ -0,0 +1,50 @@
+import os
+import platform
+
+import numpy
+import pytest
+from PIL import ImageGrab
+
+from botcity.core import xshm
+
+pytestmark = pytest.mark.skipif(
+    platform.system() != "Linux" or not os.environ.get("DISPLAY"), reason="requires an X server"
+)
+
+
+def test_xshm_capture_matches_imagegrab():
+    capture = xshm.XShmCapture()
+    try:
+        width, height = capture.size()
+        region = (0, 0, min(width, 200), min(height, 100))
+        frame = capture.grab(region)
+        assert frame.shape == (region[3], region[2], 4)
+
+        expected = numpy.asarray(ImageGrab.grab(bbox=(0, 0, region[2], region[3])).convert("RGB"))
+        assert numpy.array_equal(frame[:, :, 2::-1], expected)
+
+        full = capture.grab()
+        assert full.shape == (height, width, 4)
+        # The size is read from the X server only once
+        assert capture.size() is capture.size()
+    finally:
+        capture.close()
+
+
+def test_xshm_capture_pads_regions_outside_the_screen():
+    capture = xshm.XShmCapture()
+    try:
+        width, height = capture.size()
+        shared = capture.shared
+        frame = capture.grab((width - 50, height - 20, 100, 60))
+        assert frame.shape == (60, 100, 4)
+        assert not frame[20:, :].any()
+        assert not frame[:, 50:].any()
+
+        visible = capture.grab((width - 50, height - 20, 50, 20))
+        assert numpy.array_equal(frame[:20, :50], visible)
+
+        assert not capture.grab((width, height, 10, 10)).any()
+        assert capture.shared == shared
+    finally:
+        capture.close()
@@ -0,0 +1,78 @@
+import os
+import platform
+import time
+
+import pytest
+from Xlib import X
+from Xlib import display as xdisplay
+
+from botcity.core import xtyping
+
+
+def test_char_to_keysym():
+    assert xtyping.char_to_keysym("a") == ord("a")
+    assert xtyping.char_to_keysym("ç") == 0xE7
+    assert xtyping.char_to_keysym("\n") == 0xFF0D
+    assert xtyping.char_to_keysym("€") == 0x010020AC
+
+
+requires_x = pytest.mark.skipif(
+    platform.system() != "Linux" or not os.environ.get("DISPLAY"), reason="requires an X server"
+)
+
+
+@requires_x
+def test_xtest_typer_remaps_missing_characters():
+    typer = xtyping.XTestTyper()
+    try:
+        typer.type("")
+        keycode, _ = typer._keycode("☃", set())
+        assert typer._keycode("☃", set()) == (keycode, False)
+        assert typer.remapped == 1
+    finally:
+        typer.close()
+
+
+def _read_text(display, length, timeout=2.0):
+    """
+    The characters of the key presses received by the window of display.
+    """
+    text = ""
+    deadline = time.monotonic() + timeout
+    while len(text) < length and time.monotonic() < deadline:
+        if not display.pending_events():
+            time.sleep(0.01)
+            continue
+        event = display.next_event()
+        if event.type == X.MappingNotify:
+            display.refresh_keyboard_mapping(event)
+        elif event.type == X.KeyPress:
+            keysym = display.keycode_to_keysym(event.detail, 1 if event.state & X.ShiftMask else 0)
+            if keysym & 0xFF000000 == 0x01000000:
+                text += chr(keysym & 0xFFFFFF)
+            elif keysym < 0x100:
+                text += chr(keysym)
+    return text
+
+
+@requires_x
+def test_xtest_typer_types_into_a_window():
+    display = xdisplay.Display()
+    window = display.screen().root.create_window(
+        0, 0, 100, 100, 0, display.screen().root_depth,
+        event_mask=X.KeyPressMask | X.StructureNotifyMask,
+    )
+    window.map()
+    while display.next_event().type != X.MapNotify:
+        pass
+    window.set_input_focus(X.RevertToParent, X.CurrentTime)
+    display.sync()
+
+    typer = xtyping.XTestTyper()
+    try:
+        typer.type("aB1 ☃")
+        assert _read_text(display, 5) == "aB1 ☃"
+    finally:
+        typer.close()
+        window.destroy()
+        display.close()
@@ -0,0 +1,181 @@
+"""
+Background persistence of screenshots.
+
+Encoding a large screenshot, specially as PNG, may take hundreds of milliseconds. The
+ScreenshotWriter encodes and writes the images on worker threads so the bot does not wait for it.
+"""
+import atexit
+import os
+import queue
+import threading
+import time
+import weakref
+from typing import Optional
+
+from PIL import Image
+
+from . import config
+
+_writers = weakref.WeakSet()
+
+
+def save_image(
+    image: Image.Image, filepath: str, format: Optional[str] = None, compression: Optional[int] = None
+) -> None:
+    """
+    Save an image with the given format and compression.
+
+    Args:
+        image (Image): The image to save.
+        filepath (str): The destination file.
+        format (str, optional): The image format (e.g. "PNG", "JPEG"). Defaults to the file extension.
+        compression (int, optional): For PNG the zlib compression level (0 to 9), for JPEG and WEBP the
+            quality (1 to 100). Defaults to the Pillow default.
+    """
+    options = {}
+    if compression is not None:
+        fmt = (format or os.path.splitext(filepath)[1][1:]).upper()
+        if fmt == "PNG":
+            options["compress_level"] = compression
+        elif fmt in ("JPEG", "JPG", "WEBP"):
+            options["quality"] = compression
+    image.save(filepath, format=format, **options)
+
+
+class ScreenshotWriter:
+    """
+    Saves images on background threads.
+
+    The images wait in a bounded queue. When it is full `submit` blocks until a worker frees a slot,
+    and the time spent waiting is reported by the back-pressure counters.
+    Pending images are written when the interpreter exits.
+
+    Args:
+        workers (int, optional): Number of writer threads. Defaults to `config.SCREENSHOT_WRITER_WORKERS`.
+        queue_size (int, optional): Maximum number of images waiting to be written.
+            Defaults to `config.SCREENSHOT_WRITER_QUEUE_SIZE`.
+        format (str, optional): The image format. Defaults to `config.SCREENSHOT_FORMAT`, and to the
+            file extension when None.
+        compression (int, optional): The compression level or quality, see `save_image`.
+            Defaults to `config.SCREENSHOT_COMPRESSION`.
+
+    Attributes:
+        submitted (int): Number of images submitted.
+        written (int): Number of images written.
+        failed (int): Number of images which could not be written.
+        last_error (Exception): The error of the last image which could not be written.
+        blocked (int): Number of submissions which waited for room in the queue.
+        blocked_time (float): Total time (s) spent waiting for room in the queue.
+        max_pending (int): Largest number of images waiting in the queue.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        format: Optional[str] = None,
+        compression: Optional[int] = None,
+    ):
+        self.workers = config.SCREENSHOT_WRITER_WORKERS if workers is None else workers
+        queue_size = config.SCREENSHOT_WRITER_QUEUE_SIZE if queue_size is None else queue_size
+        if self.workers < 1:
+            raise ValueError("The number of writer workers must be at least 1.")
+        self.format = config.SCREENSHOT_FORMAT if format is None else format
+        self.compression = config.SCREENSHOT_COMPRESSION if compression is None else compression
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.written = 0
+        self.failed = 0
+        self.last_error = None
+        self.blocked = 0
+        self.blocked_time = 0.0
+        self.max_pending = 0
+        _writers.add(self)
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of images waiting to be written.
+        """
+        return self._queue.qsize()
+
+    def submit(self, image: Image.Image, filepath: str) -> None:
+        """
+        Queue an image to be saved. The image must not be modified afterwards.
+
+        Args:
+            image (Image): The image to save.
+            filepath (str): The destination file.
+        """
+        self._start()
+        item = (image, filepath)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            start = time.perf_counter()
+            self._queue.put(item)
+            with self._lock:
+                self.blocked += 1
+                self.blocked_time += time.perf_counter() - start
+        with self._lock:
+            self.submitted += 1
+            self.max_pending = max(self.max_pending, self._queue.qsize())
+
+    def flush(self) -> None:
+        """
+        Wait until every image submitted is written.
+        """
+        if self._threads:
+            self._queue.join()
+
+    def close(self) -> None:
+        """
+        Write the pending images and stop the worker threads.
+        """
+        self.flush()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _start(self) -> None:
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            threads = [
+                threading.Thread(target=self._run, name=f"ScreenshotWriter-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in threads:
+                thread.start()
+            self._threads = threads
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                image, filepath = item
+                try:
+                    save_image(image, filepath, self.format, self.compression)
+                except Exception as e:
+                    with self._lock:
+                        self.failed += 1
+                        self.last_error = e
+                else:
+                    with self._lock:
+                        self.written += 1
+            finally:
+                self._queue.task_done()
+
+
+@atexit.register
+def _flush_writers() -> None:
+    for writer in list(_writers):
+        writer.flush()
@@ -0,0 +1,296 @@
+"""
+Screen capture on X11 through the MIT Shared Memory extension (XShm).
+
+The X server writes the pixels straight into a shared memory segment which is reused by every
+capture, so grabbing the screen does not allocate a new image per frame.
+python-xlib does not ship the MIT-SHM extension, so the few requests needed are declared here.
+"""
+import ctypes
+import ctypes.util
+import platform
+import threading
+from typing import Optional, Tuple
+
+import numpy
+
+try:
+    from Xlib import X
+    from Xlib import display as xdisplay
+    from Xlib import error as xerror
+    from Xlib.protocol import rq
+except ImportError:
+    xdisplay = None
+
+EXTENSION_NAME = "MIT-SHM"
+
+IPC_PRIVATE = 0
+IPC_CREAT = 0o1000
+IPC_RMID = 0
+
+if xdisplay is not None:
+    class _QueryVersion(rq.ReplyRequest):
+        _request = rq.Struct(
+            rq.Card8("opcode"),
+            rq.Opcode(0),
+            rq.RequestLength(),
+        )
+        _reply = rq.Struct(
+            rq.ReplyCode(),
+            rq.Bool("shared_pixmaps"),
+            rq.Card16("sequence_number"),
+            rq.ReplyLength(),
+            rq.Card16("major_version"),
+            rq.Card16("minor_version"),
+            rq.Card16("uid"),
+            rq.Card16("gid"),
+            rq.Card8("pixmap_format"),
+            rq.Pad(15),
+        )
+
+    class _Attach(rq.Request):
+        _request = rq.Struct(
+            rq.Card8("opcode"),
+            rq.Opcode(1),
+            rq.RequestLength(),
+            rq.Card32("shmseg"),
+            rq.Card32("shmid"),
+            rq.Bool("read_only"),
+            rq.Pad(3),
+        )
+
+    class _Detach(rq.Request):
+        _request = rq.Struct(
+            rq.Card8("opcode"),
+            rq.Opcode(2),
+            rq.RequestLength(),
+            rq.Card32("shmseg"),
+        )
+
+    class _GetImage(rq.ReplyRequest):
+        _request = rq.Struct(
+            rq.Card8("opcode"),
+            rq.Opcode(4),
+            rq.RequestLength(),
+            rq.Drawable("drawable"),
+            rq.Int16("x"),
+            rq.Int16("y"),
+            rq.Card16("width"),
+            rq.Card16("height"),
+            rq.Card32("plane_mask"),
+            rq.Card8("format"),
+            rq.Pad(3),
+            rq.Card32("shmseg"),
+            rq.Card32("offset"),
+        )
+        _reply = rq.Struct(
+            rq.ReplyCode(),
+            rq.Card8("depth"),
+            rq.Card16("sequence_number"),
+            rq.ReplyLength(),
+            rq.Card32("visual"),
+            rq.Card32("size"),
+            rq.Pad(16),
+        )
+
+
+def _libc() -> ctypes.CDLL:
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    libc.shmget.argtypes = (ctypes.c_int, ctypes.c_size_t, ctypes.c_int)
+    libc.shmget.restype = ctypes.c_int
+    libc.shmat.argtypes = (ctypes.c_int, ctypes.c_void_p, ctypes.c_int)
+    libc.shmat.restype = ctypes.c_void_p
+    libc.shmdt.argtypes = (ctypes.c_void_p,)
+    libc.shmdt.restype = ctypes.c_int
+    libc.shmctl.argtypes = (ctypes.c_int, ctypes.c_int, ctypes.c_void_p)
+    libc.shmctl.restype = ctypes.c_int
+    return libc
+
+
+class XShmCapture:
+    """
+    Screen capture backed by a shared memory segment attached to the X server.
+
+    The frames are returned as BGRA numpy views of the shared buffer, which are only valid until
+    the next capture. Copy them if they must be kept.
+    When the X server does not support MIT-SHM (e.g. a remote display) the capture falls back to
+    a regular `GetImage` request, which allocates a new buffer per frame.
+
+    Args:
+        display_name (str, optional): The X display to connect to. Defaults to the `DISPLAY` variable.
+    """
+
+    def __init__(self, display_name: Optional[str] = None):
+        if xdisplay is None or platform.system() != "Linux":
+            raise RuntimeError("XShm capture is only available on Linux with python-xlib.")
+        self._lock = threading.Lock()
+        self._display = xdisplay.Display(display_name)
+        self._root = self._display.screen().root
+        # Notified when the root window is resized so the cached size is read again
+        self._root.change_attributes(event_mask=X.StructureNotifyMask)
+        self._size = None
+        self._opcode = None
+        self._libc = None
+        self._shmseg = None
+        self._address = None
+        self._buffer = None
+
+        info = self._display.display.info
+        formats = {fmt.depth: fmt.bits_per_pixel for fmt in info.pixmap_formats}
+        depth = self._display.screen().root_depth
+        if formats.get(depth) != 32 or info.image_byte_order != X.LSBFirst:
+            self.close()
+            raise RuntimeError("Only 32 bits per pixel little endian displays are supported.")
+
+        if self._display.has_extension(EXTENSION_NAME):
+            try:
+                self._opcode = self._display.get_extension_major(EXTENSION_NAME)
+                _QueryVersion(display=self._display.display, opcode=self._opcode)
+                self._libc = _libc()
+            except Exception:
+                self._opcode = None
+
+    @property
+    def shared(self) -> bool:
+        """
+        Whether or not the frames are read through shared memory.
+        """
+        return self._opcode is not None
+
+    def size(self) -> Tuple[int, int]:
+        """
+        The root window dimension in pixels.
+
+        The size is cached and read again only after the X server reports that the root window
+        was reconfigured, e.g. on a resolution change.
+
+        Returns:
+            size (Tuple): The screen width and height in pixels.
+        """
+        while self._display.pending_events():
+            if self._display.next_event().type == X.ConfigureNotify:
+                self._size = None
+        if self._size is None:
+            geometry = self._root.get_geometry()
+            self._size = (geometry.width, geometry.height)
+        return self._size
+
+    def grab(self, region: Optional[Tuple[int, int, int, int]] = None) -> numpy.ndarray:
+        """
+        Capture the screen.
+
+        Args:
+            region (tuple, optional): Bounding box containing left, top, width and height to capture.
+                The parts outside the screen are black. Defaults to the whole screen.
+
+        Returns:
+            frame (numpy.ndarray): A height x width x 4 BGRA array. When shared memory is used and the
+                region lies inside the screen it is a view of the shared buffer, overwritten by the
+                next capture.
+        """
+        with self._lock:
+            screen_w, screen_h = self.size()
+            if region is None:
+                region = (0, 0, screen_w, screen_h)
+            x, y, width, height = region
+            left, top = max(x, 0), max(y, 0)
+            right, bottom = min(x + width, screen_w), min(y + height, screen_h)
+            if (left, top, right, bottom) == (x, y, x + width, y + height):
+                return self._grab(x, y, width, height)
+
+            # The X server rejects areas outside the root window, pad them as Pillow crops do
+            frame = numpy.zeros((height, width, 4), dtype=numpy.uint8)
+            if right > left and bottom > top:
+                area = self._grab(left, top, right - left, bottom - top)
+                frame[top - y:bottom - y, left - x:right - x] = area
+            return frame
+
+    def close(self) -> None:
+        """
+        Detach the shared memory segment and close the connection to the X server.
+        """
+        with self._lock:
+            self._release()
+            if self._display is not None:
+                self._display.close()
+                self._display = None
+
+    def _grab(self, x: int, y: int, width: int, height: int) -> numpy.ndarray:
+        if self.shared:
+            try:
+                self._reserve(width * height * 4)
+            except OSError:
+                # e.g. the server is not on this machine, stop trying
+                self._release()
+                self._opcode = None
+            else:
+                return self._grab_shared(x, y, width, height)
+        reply = self._root.get_image(x, y, width, height, X.ZPixmap, 0xFFFFFFFF)
+        return numpy.frombuffer(reply.data, dtype=numpy.uint8).reshape(height, width, 4)
+
+    def _reserve(self, size: int) -> None:
+        if self._buffer is None or self._buffer.size < size:
+            self._release()
+            # Room for the whole screen so region grabs never reallocate
+            screen_w, screen_h = self.size()
+            self._allocate(max(size, screen_w * screen_h * 4))
+
+    def _grab_shared(self, x: int, y: int, width: int, height: int) -> numpy.ndarray:
+        size = width * height * 4
+        _GetImage(
+            display=self._display.display,
+            opcode=self._opcode,
+            drawable=self._root,
+            x=x,
+            y=y,
+            width=width,
+            height=height,
+            plane_mask=0xFFFFFFFF,
+            format=X.ZPixmap,
+            shmseg=self._shmseg,
+            offset=0,
+        )
+        return self._buffer[:size].reshape(height, width, 4)
+
+    def _allocate(self, size: int) -> None:
+        shmid = self._libc.shmget(IPC_PRIVATE, size, IPC_CREAT | 0o600)
+        if shmid < 0:
+            raise OSError(ctypes.get_errno(), "shmget failed")
+        address = self._libc.shmat(shmid, None, 0)
+        if address in (None, ctypes.c_void_p(-1).value):
+            self._libc.shmctl(shmid, IPC_RMID, None)
+            raise OSError(ctypes.get_errno(), "shmat failed")
+
+        catcher = xerror.CatchError()
+        shmseg = self._display.display.allocate_resource_id()
+        _Attach(
+            display=self._display.display,
+            onerror=catcher,
+            opcode=self._opcode,
+            shmseg=shmseg,
+            shmid=shmid,
+            read_only=False,
+        )
+        self._display.sync()
+        # The segment is destroyed once both this process and the X server detach from it
+        self._libc.shmctl(shmid, IPC_RMID, None)
+        if catcher.get_error():
+            self._libc.shmdt(address)
+            raise OSError("The X server could not attach the shared memory segment.")
+
+        self._shmseg = shmseg
+        self._address = address
+        self._buffer = numpy.ctypeslib.as_array((ctypes.c_uint8 * size).from_address(address))
+
+    def _release(self) -> None:
+        if self._shmseg is not None:
+            try:
+                _Detach(display=self._display.display, opcode=self._opcode, shmseg=self._shmseg)
+                self._display.sync()
+            except Exception:
+                pass
+            self._display.display.free_resource_id(self._shmseg)
+            self._shmseg = None
+        if self._address is not None:
+            self._buffer = None
+            self._libc.shmdt(self._address)
+            self._address = None
@@ -0,0 +1,212 @@
+"""
+Text typing on X11 through the XTEST extension.
+
+The key events of a whole string are queued on the connection and sent with a single flush
+instead of one round trip per character. Characters missing from the keyboard layout are typed
+by remapping spare keycodes, which are kept in a cache and reused for the next strings.
+"""
+import atexit
+import os
+import platform
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from Xlib import X, XK
+    from Xlib import display as xdisplay
+    from Xlib.ext import xtest
+except ImportError:
+    xdisplay = None
+
+EXTENSION_NAME = "XTEST"
+
+_typers = weakref.WeakSet()
+
+# Characters typed with a special key, as pynput does.
+_CONTROL_KEYSYMS = {"\n": 0xFF0D, "\r": 0xFF0D, "\t": 0xFF09}
+
+# Minimum time (s) between sending the events of a remapped keycode and mapping it to another
+# character, so the application reads them before it is notified of the new mapping.
+REMAP_DELAY = 0.05
+
+
+def char_to_keysym(char: str) -> int:
+    """
+    The X keysym of a character.
+
+    Args:
+        char (str): The character.
+
+    Returns:
+        keysym (int): The keysym.
+    """
+    if char in _CONTROL_KEYSYMS:
+        return _CONTROL_KEYSYMS[char]
+    code = ord(char)
+    # Latin-1 keysyms match the code points, the others are the code point plus 0x01000000
+    if 0x20 <= code <= 0x7E or 0xA0 <= code <= 0xFF:
+        return code
+    return 0x01000000 | code
+
+
+class XTestTyper:
+    """
+    Types text by sending XTEST key events to the X server.
+
+    The keycodes remapped for characters missing from the layout stay mapped while the typer is
+    open, since the application may still be processing the events, and are restored on `close` or
+    when the interpreter exits.
+
+    Args:
+        display_name (str, optional): The X display to connect to. Defaults to the `DISPLAY` variable.
+
+    Attributes:
+        remapped (int): Number of times a spare keycode was remapped.
+    """
+
+    def __init__(self, display_name: Optional[str] = None):
+        if xdisplay is None or platform.system() != "Linux":
+            raise RuntimeError("XTEST typing is only available on Linux with python-xlib.")
+        self._lock = threading.Lock()
+        self._display = xdisplay.Display(display_name)
+        if not self._display.has_extension(EXTENSION_NAME):
+            self._display.close()
+            raise RuntimeError("The X server does not support the XTEST extension.")
+        self._shift = self._shift_keycode()
+        self._cache: Dict[int, Tuple[int, bool]] = {}
+        # Spare keycodes, the least recently used first
+        self._spare = self._spare_keycodes()
+        self._remaps: Dict[int, int] = {}
+        # When the events of each remapped keycode were last sent
+        self._sent_at: Dict[int, float] = {}
+        self.remapped = 0
+        _typers.add(self)
+
+    @classmethod
+    def available(cls) -> bool:
+        """
+        Whether or not XTEST typing can be used on this host.
+        """
+        return xdisplay is not None and platform.system() == "Linux" and bool(os.environ.get("DISPLAY"))
+
+    def type(self, text: str, interval: int = 0) -> None:
+        """
+        Type a text.
+
+        Args:
+            text (str): The text to be typed.
+            interval (int, optional): Interval (ms) between each key press. Defaults to 0, which sends
+                every key event at once.
+        """
+        with self._lock:
+            self._process_events()
+            # Remapped keycodes used by the events not sent yet, which cannot be remapped again
+            pending = set()
+            for char in text:
+                keycode, shift = self._keycode(char, pending)
+                if shift:
+                    xtest.fake_input(self._display, X.KeyPress, self._shift)
+                xtest.fake_input(self._display, X.KeyPress, keycode)
+                xtest.fake_input(self._display, X.KeyRelease, keycode)
+                if shift:
+                    xtest.fake_input(self._display, X.KeyRelease, self._shift)
+                if interval:
+                    self._flush(pending)
+                    time.sleep(interval / 1000.0)
+            self._flush(pending)
+
+    def close(self) -> None:
+        """
+        Restore the remapped keycodes and close the connection to the X server.
+        """
+        with self._lock:
+            if self._display is None:
+                return
+            for keycode in self._remaps:
+                self._display.change_keyboard_mapping(keycode, [(X.NoSymbol, X.NoSymbol)])
+            self._display.sync()
+            self._display.close()
+            self._display = None
+
+    def _flush(self, pending: set) -> None:
+        self._display.sync()
+        now = time.monotonic()
+        for keycode in pending:
+            self._sent_at[keycode] = now
+        pending.clear()
+
+    def _process_events(self) -> None:
+        # The server notifies every client, this one included, of each keyboard mapping change
+        changed = False
+        while self._display.pending_events():
+            event = self._display.next_event()
+            if event.type == X.MappingNotify and event.request == X.MappingKeyboard:
+                self._display.refresh_keyboard_mapping(event)
+                changed = True
+        if changed:
+            # The layout may have changed too, look its keys up again
+            self._cache = {
+                keysym: entry for keysym, entry in self._cache.items() if entry[0] in self._remaps
+            }
+            self._shift = self._shift_keycode()
+
+    def _shift_keycode(self) -> int:
+        # 0 when the layout has no shift key
+        return self._display.keysym_to_keycode(XK.XK_Shift_L) or self._display.keysym_to_keycode(XK.XK_Shift_R)
+
+    def _spare_keycodes(self) -> List[int]:
+        info = self._display.display.info
+        first, last = info.min_keycode, info.max_keycode
+        mapping = self._display.get_keyboard_mapping(first, last - first + 1)
+        return [first + i for i, keysyms in enumerate(mapping) if not any(keysyms)]
+
+    def _keycode(self, char: str, pending: set) -> Tuple[int, bool]:
+        keysym = char_to_keysym(char)
+        cached = self._cache.get(keysym)
+        if cached is not None:
+            keycode, _ = cached
+            if keycode in self._remaps:
+                # Mark as recently used
+                self._spare.remove(keycode)
+                self._spare.append(keycode)
+                pending.add(keycode)
+            return cached
+
+        for keycode, index in self._display.keysym_to_keycodes(keysym):
+            if index == 0 or (index == 1 and self._shift):
+                self._cache[keysym] = (keycode, index == 1)
+                return self._cache[keysym]
+        return self._remap(keysym, pending)
+
+    def _remap(self, keysym: int, pending: set) -> Tuple[int, bool]:
+        if not self._spare:
+            raise RuntimeError("No spare keycode to type the character.")
+        keycode = self._spare[0]
+        if keycode in pending:
+            # Every spare keycode is used by the events not sent yet
+            self._flush(pending)
+        self._spare.append(self._spare.pop(0))
+        previous = self._remaps.get(keycode)
+        if previous is not None:
+            self._cache.pop(previous, None)
+            delay = self._sent_at.get(keycode, 0.0) + REMAP_DELAY - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        self._display.change_keyboard_mapping(keycode, [(keysym, keysym)])
+        self._remaps[keycode] = keysym
+        self._cache[keysym] = (keycode, False)
+        pending.add(keycode)
+        self.remapped += 1
+        return keycode, False
+
+
+@atexit.register
+def _close_typers() -> None:
+    for typer in list(_typers):
+        try:
+            typer.close()
+        except Exception:
+            # e.g. the connection to the X server was lost
+            pass